@@ -16,11 +16,13 @@ import argparse
 import sys
 from pathlib import Path
 
+from lib.generation_queue import get_generation_queue
 from lib.generation_queue_client import (
     TaskFailedError,
     WorkerOfflineError,
     enqueue_and_wait,
     is_worker_online,
+    wait_for_tasks,
 )
 from lib.media_generator import MediaGenerator
 from lib.project_manager import ProjectManager
@@ -122,11 +124,10 @@ def list_pending_clues(project_name: str) -> None:
 
     print(f"\n📋 待生成的线索 ({len(pending)} 个):\n")
     for clue in pending:
-        clue_type = clue.get('type', 'prop')
-        type_emoji = "📦" if clue_type == 'prop' else "🏠"
-        print(f"  {type_emoji} {clue['name']}")
-        print(f"     类型: {clue_type}")
-        print(f"     描述: {clue.get('description', '')[:60]}...")
+        type_emoji = "📦" if clue.type == 'prop' else "🏠"
+        print(f"  {type_emoji} {clue.name}")
+        print(f"     类型: {clue.type}")
+        print(f"     描述: {clue.description[:60]}...")
         print()
 
 
@@ -141,27 +142,81 @@ def generate_all_clues(project_name: str) -> tuple:
         (成功数, 失败数)
     """
     pm = ProjectManager()
-    pending = pm.get_pending_clues(project_name)
-
-    if not pending:
-        print(f"✅ 项目 '{project_name}' 中所有重要线索都已有设计图")
-        return (0, 0)
 
-    print(f"\n🚀 开始生成 {len(pending)} 个线索设计图...\n")
+    if is_worker_online():
+        try:
+            return _generate_all_clues_via_queue(pm, project_name)
+        except WorkerOfflineError:
+            print("ℹ️  队列 worker 已离线，剩余线索回退直连生成")
 
     success_count = 0
     fail_count = 0
 
-    for clue in pending:
+    # 逐个取出待处理线索，识别出第一个即开始生成，无需等待全部扫描完成
+    for clue in pm.iter_pending_clues(project_name):
+        if success_count + fail_count == 0:
+            print(f"\n🚀 开始生成线索设计图...\n")
         try:
-            generate_clue(project_name, clue['name'])
+            generate_clue(project_name, clue.name)
             success_count += 1
             print()
         except Exception as e:
-            print(f"❌ 生成 '{clue['name']}' 失败: {e}")
+            print(f"❌ 生成 '{clue.name}' 失败: {e}")
             fail_count += 1
             print()
 
+    if success_count + fail_count == 0:
+        print(f"✅ 项目 '{project_name}' 中所有重要线索都已有设计图")
+        return (0, 0)
+
+    print(f"\n{'=' * 40}")
+    print(f"生成完成!")
+    print(f"   ✅ 成功: {success_count}")
+    print(f"   ❌ 失败: {fail_count}")
+    print(f"{'=' * 40}")
+
+    return (success_count, fail_count)
+
+
+def _generate_all_clues_via_queue(pm: ProjectManager, project_name: str) -> tuple:
+    """
+    一次性入队全部待处理线索，由 worker 按图片通道并发执行，再批量等待结果
+
+    Returns:
+        (成功数, 失败数)
+    """
+    queue = get_generation_queue()
+    task_names = {}
+    for clue in pm.iter_pending_clues(project_name):
+        queued = queue.enqueue_task(
+            project_name=project_name,
+            task_type="clue",
+            media_type="image",
+            resource_id=clue.name,
+            payload={"prompt": clue.description},
+            source="skill",
+        )
+        task_names[queued["task_id"]] = clue.name
+
+    if not task_names:
+        print(f"✅ 项目 '{project_name}' 中所有重要线索都已有设计图")
+        return (0, 0)
+
+    print(f"\n🚀 已入队 {len(task_names)} 个线索设计图任务，等待生成...\n")
+    tasks = wait_for_tasks(list(task_names))
+
+    success_count = 0
+    fail_count = 0
+    for task_id, clue_name in task_names.items():
+        task = tasks[task_id]
+        if task["status"] == "succeeded":
+            relative_path = (task.get("result") or {}).get("file_path") or f"clues/{clue_name}.png"
+            print(f"✅ 线索设计图已保存: {relative_path}")
+            success_count += 1
+        else:
+            print(f"❌ 生成 '{clue_name}' 失败: {task.get('error_message') or 'task failed'}")
+            fail_count += 1
+
     print(f"\n{'=' * 40}")
     print(f"生成完成!")
     print(f"   ✅ 成功: {success_count}")
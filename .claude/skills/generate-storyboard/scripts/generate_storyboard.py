@@ -39,7 +39,7 @@ from lib.generation_queue_client import (
 )
 from lib.gemini_client import GeminiClient, RateLimiter
 from lib.media_generator import MediaGenerator
-from lib.project_manager import ProjectManager
+from lib.project_manager import ProjectManager, make_exists_checker
 from lib.prompt_utils import (
     image_prompt_to_yaml,
     is_structured_image_prompt
@@ -475,6 +475,9 @@ def generate_individual_scenes(
     # 使用锁保护剧本更新操作（线程安全）
     script_update_lock = threading.Lock()
 
+    # 各场景共用的设计图存在性检查：每个目录只列一次，不再逐场景 stat
+    sheet_exists = make_exists_checker(project_dir)
+
     def generate_single_scene(task_data: Tuple[int, dict]) -> Path:
         idx, scene = task_data
         scene_id = scene[id_field]
@@ -483,22 +486,18 @@ def generate_individual_scenes(
         reference_images = [grid_image_path]
 
         # 人物参考图
-        for char_name in scene.get(char_field, []):
+        for char_name in scene.get(char_field, ()):
             if char_name in characters:
                 char_sheet = characters[char_name].get('character_sheet', '')
-                if char_sheet:
-                    char_path = project_dir / char_sheet
-                    if char_path.exists():
-                        reference_images.append(char_path)
+                if char_sheet and sheet_exists(char_sheet):
+                    reference_images.append(project_dir / char_sheet)
 
         # 线索参考图
-        for clue_name in scene.get(clue_field, []):
+        for clue_name in scene.get(clue_field, ()):
             if clue_name in clues:
                 clue_sheet = clues[clue_name].get('clue_sheet', '')
-                if clue_sheet:
-                    clue_path = project_dir / clue_sheet
-                    if clue_path.exists():
-                        reference_images.append(clue_path)
+                if clue_sheet and sheet_exists(clue_sheet):
+                    reference_images.append(project_dir / clue_sheet)
 
         # 构建 prompt（包含宫格位置信息、线索信息和项目风格）
         prompt = build_scene_prompt(scene, characters, idx, total_in_grid, clues, style, id_field, char_field, clue_field)
@@ -619,8 +618,8 @@ def generate_storyboard_grid(
     all_characters = set()
     all_clues = set()
     for scene in scenes:
-        all_characters.update(scene.get(char_field, []))
-        all_clues.update(scene.get(clue_field, []))
+        all_characters.update(scene.get(char_field, ()))
+        all_clues.update(scene.get(clue_field, ()))
 
     reference_images = []
 
@@ -1033,27 +1032,26 @@ def generate_storyboard_direct(
     # 创建失败记录器
     recorder = FailureRecorder(project_dir / 'storyboards')
 
+    # 各片段共用的设计图存在性检查：每个目录只列一次，不再逐片段 stat
+    sheet_exists = make_exists_checker(project_dir)
+
     def generate_single(segment: dict) -> Path:
         segment_id = segment[id_field]
 
         # 收集参考图：仅 character_sheet 和 clue_sheet
         reference_images = []
 
-        for char_name in segment.get(char_field, []):
+        for char_name in segment.get(char_field, ()):
             if char_name in characters:
                 char_sheet = characters[char_name].get('character_sheet', '')
-                if char_sheet:
-                    char_path = project_dir / char_sheet
-                    if char_path.exists():
-                        reference_images.append(char_path)
+                if char_sheet and sheet_exists(char_sheet):
+                    reference_images.append(project_dir / char_sheet)
 
-        for clue_name in segment.get(clue_field, []):
+        for clue_name in segment.get(clue_field, ()):
             if clue_name in clues:
                 clue_sheet = clues[clue_name].get('clue_sheet', '')
-                if clue_sheet:
-                    clue_path = project_dir / clue_sheet
-                    if clue_path.exists():
-                        reference_images.append(clue_path)
+                if clue_sheet and sheet_exists(clue_sheet):
+                    reference_images.append(project_dir / clue_sheet)
 
         # 构建 prompt（直接生成，无需参考多宫格）
         prompt = build_direct_scene_prompt(
@@ -139,7 +139,7 @@ def parse_scene_ids(scenes_arg: str) -> list:
     return [s.strip() for s in scenes_arg.split(',') if s.strip()]
 
 
-def validate_duration(duration: int) -> str:
+def validate_duration(duration: int) -> int:
     """
     验证并返回有效的时长参数
 
@@ -149,16 +149,16 @@ def validate_duration(duration: int) -> str:
         duration: 输入的时长（秒）
 
     Returns:
-        有效的时长字符串
+        有效的时长（秒）
     """
     valid_durations = [4, 6, 8]
     if duration in valid_durations:
-        return str(duration)
+        return duration
     # 向上取整到最近的有效值
     for d in valid_durations:
         if d >= duration:
-            return str(d)
-    return "8"  # 最大值
+            return d
+    return 8  # 最大值
 
 
 def get_default_max_workers() -> int:
@@ -255,7 +255,7 @@ def _generate_video_direct(
     resource_id: str,
     storyboard_path: Path,
     aspect_ratio: str,
-    duration_seconds: str,
+    duration_seconds: int,
 ) -> Path:
     """回退直连生成视频。"""
     generator = MediaGenerator(project_dir, rate_limiter=rate_limiter)
@@ -485,23 +485,23 @@ def generate_episode_video(
         # 直接使用 video_prompt 字段
         prompt = get_video_prompt(item)
         duration = item.get('duration_seconds', default_duration)
-        duration_str = validate_duration(duration)
+        video_duration = validate_duration(duration)
 
         tasks.append({
             "order_index": idx,
             "item_id": item_id,
             "storyboard_path": storyboard_path,
             "prompt": prompt,
-            "duration_str": duration_str,
+            "video_duration": video_duration,
         })
 
     def generate_single_item(task: dict) -> tuple[int, Path]:
         item_id = task["item_id"]
         storyboard_path = task["storyboard_path"]
         prompt = task["prompt"]
-        duration_str = task["duration_str"]
+        video_duration = task["video_duration"]
 
-        print(f"    🎥 生成视频（{duration_str}秒）... {item_id}")
+        print(f"    🎥 生成视频（{video_duration}秒）... {item_id}")
 
         if queue_worker_online:
             try:
@@ -513,7 +513,7 @@ def generate_episode_video(
                     payload={
                         "prompt": prompt,
                         "script_file": script_filename,
-                        "duration_seconds": int(duration_str),
+                        "duration_seconds": video_duration,
                     },
                     script_file=script_filename,
                     source="skill",
@@ -529,7 +529,7 @@ def generate_episode_video(
                     resource_id=item_id,
                     storyboard_path=storyboard_path,
                     aspect_ratio=video_aspect_ratio,
-                    duration_seconds=duration_str,
+                    duration_seconds=video_duration,
                 )
                 relative_path = f"videos/scene_{item_id}.mp4"
                 with script_update_lock:
@@ -547,7 +547,7 @@ def generate_episode_video(
                 resource_id=item_id,
                 storyboard_path=storyboard_path,
                 aspect_ratio=video_aspect_ratio,
-                duration_seconds=duration_str,
+                duration_seconds=video_duration,
             )
             relative_path = f"videos/scene_{item_id}.mp4"
             with script_update_lock:
@@ -661,7 +661,7 @@ def generate_scene_video(
     # 获取时长（说书模式默认 4 秒，剧集动画默认 8 秒）
     default_duration = 4 if content_mode == 'narration' else 8
     duration = item.get('duration_seconds', default_duration)
-    duration_str = validate_duration(duration)
+    video_duration = validate_duration(duration)
 
     queue_worker_online = is_worker_online()
     rate_limiter = get_shared_rate_limiter()
@@ -681,7 +681,7 @@ def generate_scene_video(
                 payload={
                     "prompt": prompt,
                     "script_file": script_filename,
-                    "duration_seconds": int(duration_str),
+                    "duration_seconds": video_duration,
                 },
                 script_file=script_filename,
                 source="skill",
@@ -697,7 +697,7 @@ def generate_scene_video(
                 resource_id=scene_id,
                 storyboard_path=storyboard_path,
                 aspect_ratio=video_aspect_ratio,
-                duration_seconds=duration_str,
+                duration_seconds=video_duration,
             )
             relative_path = f"videos/scene_{scene_id}.mp4"
             pm.update_scene_asset(project_name, script_filename, scene_id, 'video_clip', relative_path)
@@ -711,7 +711,7 @@ def generate_scene_video(
             resource_id=scene_id,
             storyboard_path=storyboard_path,
             aspect_ratio=video_aspect_ratio,
-            duration_seconds=duration_str,
+            duration_seconds=video_duration,
         )
         relative_path = f"videos/scene_{scene_id}.mp4"
         pm.update_scene_asset(project_name, script_filename, scene_id, 'video_clip', relative_path)
@@ -787,13 +787,13 @@ def generate_all_videos(project_name: str, script_filename: str, max_workers: in
             continue
 
         duration = item.get('duration_seconds', default_duration)
-        duration_str = validate_duration(duration)
+        video_duration = validate_duration(duration)
 
         tasks.append({
             "item_id": item_id,
             "storyboard_path": storyboard_path,
             "prompt": prompt,
-            "duration_str": duration_str,
+            "video_duration": video_duration,
         })
 
     if not tasks:
@@ -806,9 +806,9 @@ def generate_all_videos(project_name: str, script_filename: str, max_workers: in
         item_id = task["item_id"]
         storyboard_path = task["storyboard_path"]
         prompt = task["prompt"]
-        duration_str = task["duration_str"]
+        video_duration = task["video_duration"]
 
-        print(f"🎥 生成视频（{duration_str}秒）... {item_id}")
+        print(f"🎥 生成视频（{video_duration}秒）... {item_id}")
         if queue_worker_online:
             try:
                 queued = enqueue_and_wait(
@@ -819,7 +819,7 @@ def generate_all_videos(project_name: str, script_filename: str, max_workers: in
                     payload={
                         "prompt": prompt,
                         "script_file": script_filename,
-                        "duration_seconds": int(duration_str),
+                        "duration_seconds": video_duration,
                     },
                     script_file=script_filename,
                     source="skill",
@@ -835,7 +835,7 @@ def generate_all_videos(project_name: str, script_filename: str, max_workers: in
                     resource_id=item_id,
                     storyboard_path=storyboard_path,
                     aspect_ratio=video_aspect_ratio,
-                    duration_seconds=duration_str,
+                    duration_seconds=video_duration,
                 )
                 relative_path = f"videos/scene_{item_id}.mp4"
                 with script_update_lock:
@@ -850,7 +850,7 @@ def generate_all_videos(project_name: str, script_filename: str, max_workers: in
                 resource_id=item_id,
                 storyboard_path=storyboard_path,
                 aspect_ratio=video_aspect_ratio,
-                duration_seconds=duration_str,
+                duration_seconds=video_duration,
             )
             relative_path = f"videos/scene_{item_id}.mp4"
             with script_update_lock:
@@ -911,16 +911,19 @@ def generate_selected_videos(
     video_aspect_ratio = get_aspect_ratio(project_data, 'video')
     all_items, id_field, _, _ = get_items_from_script(script)
 
-    # 筛选指定的场景
+    # 筛选指定的场景（先建 ID 索引，避免每个 ID 都线性扫描）
+    items_by_id = {}
+    for item in all_items:
+        for key in (item.get(id_field), item.get('scene_id')):
+            if key is not None:
+                items_by_id.setdefault(key, item)
+
     selected_items = []
     for scene_id in scene_ids:
-        found = False
-        for item in all_items:
-            if item.get(id_field) == scene_id or item.get('scene_id') == scene_id:
-                selected_items.append(item)
-                found = True
-                break
-        if not found:
+        item = items_by_id.get(scene_id)
+        if item is not None:
+            selected_items.append(item)
+        else:
             print(f"⚠️  场景/片段 '{scene_id}' 不存在，跳过")
 
     if not selected_items:
@@ -996,23 +999,23 @@ def generate_selected_videos(
 
         prompt = get_video_prompt(item)
         duration = item.get('duration_seconds', default_duration)
-        duration_str = validate_duration(duration)
+        video_duration = validate_duration(duration)
 
         tasks.append({
             "order_index": idx,
             "item_id": item_id,
             "storyboard_path": storyboard_path,
             "prompt": prompt,
-            "duration_str": duration_str,
+            "video_duration": video_duration,
         })
 
     def generate_single_item(task: dict) -> tuple[int, Path]:
         item_id = task["item_id"]
         storyboard_path = task["storyboard_path"]
         prompt = task["prompt"]
-        duration_str = task["duration_str"]
+        video_duration = task["video_duration"]
 
-        print(f"    🎥 生成视频（{duration_str}秒）... {item_id}")
+        print(f"    🎥 生成视频（{video_duration}秒）... {item_id}")
         if queue_worker_online:
             try:
                 queued = enqueue_and_wait(
@@ -1023,7 +1026,7 @@ def generate_selected_videos(
                     payload={
                         "prompt": prompt,
                         "script_file": script_filename,
-                        "duration_seconds": int(duration_str),
+                        "duration_seconds": video_duration,
                     },
                     script_file=script_filename,
                     source="skill",
@@ -1039,7 +1042,7 @@ def generate_selected_videos(
                     resource_id=item_id,
                     storyboard_path=storyboard_path,
                     aspect_ratio=video_aspect_ratio,
-                    duration_seconds=duration_str,
+                    duration_seconds=video_duration,
                 )
                 relative_path = f"videos/scene_{item_id}.mp4"
                 with script_update_lock:
@@ -1057,7 +1060,7 @@ def generate_selected_videos(
                 resource_id=item_id,
                 storyboard_path=storyboard_path,
                 aspect_ratio=video_aspect_ratio,
-                duration_seconds=duration_str,
+                duration_seconds=video_duration,
             )
             relative_path = f"videos/scene_{item_id}.mp4"
             with script_update_lock:
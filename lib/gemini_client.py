@@ -12,7 +12,7 @@ import os
 import random
 import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Type, Union
 
@@ -198,6 +198,58 @@ def get_shared_rate_limiter() -> "RateLimiter":
         return _shared_rate_limiter
 
 
+# 参考图原始字节缓存：(路径, mtime_ns, size) -> (bytes, mime_type)
+# 同一批分镜会反复引用相同的人物/线索图，直接复用文件字节，免去每次 PIL 解码 + SDK 重新编码
+REFERENCE_IMAGE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_reference_image_cache: "OrderedDict[Tuple[str, int, int], Tuple[bytes, str]]" = OrderedDict()
+_reference_image_cache_bytes = 0
+_reference_image_cache_lock = threading.Lock()
+
+
+def _sniff_image_mime_type(data: bytes) -> Optional[str]:
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    return None
+
+
+def _load_reference_image_bytes(path: Path) -> Optional[Tuple[bytes, str]]:
+    """
+    读取 PNG/JPEG 参考图的原始字节（带 LRU 缓存）
+
+    Returns:
+        (bytes, mime_type)；其他格式返回 None，由调用方回退到 PIL 加载
+    """
+    global _reference_image_cache_bytes
+
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    with _reference_image_cache_lock:
+        cached = _reference_image_cache.get(key)
+        if cached is not None:
+            _reference_image_cache.move_to_end(key)
+            return cached
+
+    data = path.read_bytes()
+    mime_type = _sniff_image_mime_type(data)
+    if mime_type is None:
+        return None
+
+    entry = (data, mime_type)
+    if len(data) > REFERENCE_IMAGE_CACHE_MAX_BYTES:
+        return entry
+
+    with _reference_image_cache_lock:
+        if key not in _reference_image_cache:
+            _reference_image_cache[key] = entry
+            _reference_image_cache_bytes += len(data)
+            while _reference_image_cache_bytes > REFERENCE_IMAGE_CACHE_MAX_BYTES:
+                _, (evicted, _) = _reference_image_cache.popitem(last=False)
+                _reference_image_cache_bytes -= len(evicted)
+    return entry
+
+
 def with_retry(
     max_attempts: int = 5,
     backoff_seconds: Tuple[int, ...] = (2, 4, 8, 16, 32),
@@ -461,7 +513,7 @@ class GeminiClient:
         if isinstance(image, Image.Image):
             return None
 
-        path = Path(image)
+        path = image if isinstance(image, Path) else Path(image)
         filename = path.stem  # 不含扩展名的文件名
 
         # 跳过通用文件名模式
@@ -496,14 +548,24 @@ class GeminiClient:
         if reference_images:
             labeled_refs = []
             for img in reference_images:
+                # 字符串路径只转换一次，供名称推断与读取共用
+                if isinstance(img, str):
+                    img = Path(img)
+
                 name = self._extract_name_from_path(img)
                 if name:
                     labeled_refs.append(name)
                     contents.append(name)
 
-                # 加载图片
-                if isinstance(img, (str, Path)):
-                    loaded_img = Image.open(img)
+                # 加载图片（PNG/JPEG 直接以原始字节传入）
+                if isinstance(img, Path):
+                    raw = _load_reference_image_bytes(img)
+                    if raw is not None:
+                        loaded_img = self.types.Part.from_bytes(
+                            data=raw[0], mime_type=raw[1]
+                        )
+                    else:
+                        loaded_img = Image.open(img)
                 else:
                     loaded_img = img
                 contents.append(loaded_img)
@@ -526,19 +588,40 @@ class GeminiClient:
             ),
         )
 
+    def _find_image_part(self, response):
+        """返回响应中第一个内联图片 part"""
+        for part in response.parts:
+            if part.inline_data is not None:
+                return part
+        raise RuntimeError("API 未返回图片")
+
+    @staticmethod
+    def _save_image_part(part, output_path: Union[str, Path]) -> Image.Image:
+        """
+        保存图片 part 并返回图片对象
+
+        响应已是 PNG 时原样写入解码后的字节（不经过图片对象重新编码）；
+        其他格式（如 JPEG/WebP）用 PIL 按输出路径扩展名重新编码，保证 .png 文件内容确为 PNG
+        （SDK 的 as_image().save 只会原样写出字节）。
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        data = part.inline_data.data
+        if part.inline_data.mime_type == "image/png":
+            output_path.write_bytes(data)
+        else:
+            with Image.open(io.BytesIO(data)) as decoded:
+                decoded.save(output_path)
+        return part.as_image()
+
     def _process_image_response(
         self, response, output_path: Optional[Union[str, Path]] = None
     ) -> Image.Image:
         """解析图片生成响应并可选保存"""
-        for part in response.parts:
-            if part.inline_data is not None:
-                image = part.as_image()
-                if output_path:
-                    output_path = Path(output_path)
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-                    image.save(output_path)
-                return image
-        raise RuntimeError("API 未返回图片")
+        part = self._find_image_part(response)
+        if output_path:
+            return self._save_image_part(part, output_path)
+        return part.as_image()
 
     @with_retry(max_attempts=5, backoff_seconds=(2, 4, 8, 16, 32))
     def generate_image(
@@ -614,7 +697,11 @@ class GeminiClient:
             model=self.IMAGE_MODEL, contents=contents, config=config
         )
 
-        return self._process_image_response(response, output_path)
+        # 写盘放到线程中，避免大图阻塞事件循环
+        part = self._find_image_part(response)
+        if output_path:
+            return await asyncio.to_thread(self._save_image_part, part, output_path)
+        return part.as_image()
 
     @with_retry(max_attempts=3, backoff_seconds=(2, 4, 8))
     def generate_image_with_chat(
@@ -668,7 +755,7 @@ class GeminiClient:
         video: Optional[Union[str, Path]] = None,
         # 配置参数
         aspect_ratio: str = "9:16",
-        duration_seconds: str = "8",
+        duration_seconds: int = 8,
         resolution: str = "1080p",
         negative_prompt: str = "music, BGM, background music, subtitles, low quality",
         output_path: Optional[Union[str, Path]] = None,
@@ -694,7 +781,7 @@ class GeminiClient:
 
             # 配置参数
             aspect_ratio: 宽高比，默认 9:16（生成模式使用）
-            duration_seconds: 视频时长，可选 "4", "6", "8"（生成模式使用）
+            duration_seconds: 视频时长（秒），可选 4, 6, 8（生成模式使用）
             resolution: 分辨率，可选 "720p", "1080p", "4k"（延长模式强制 720p）
             negative_prompt: 负面提示词，指定不想要的元素（默认禁止 BGM）
             output_path: 本地输出路径
@@ -881,7 +968,7 @@ class GeminiClient:
         self,
         aspect_ratio: str,
         resolution: str,
-        duration_seconds: str,
+        duration_seconds: int,
         negative_prompt: str,
     ):
         """构建视频生成配置"""
@@ -968,7 +1055,7 @@ class GeminiClient:
         video: Optional[Union[str, Path]] = None,
         # 配置参数
         aspect_ratio: str = "9:16",
-        duration_seconds: str = "8",
+        duration_seconds: int = 8,
         resolution: str = "1080p",
         negative_prompt: str = "music, BGM, background music, subtitles, low quality",
         output_path: Optional[Union[str, Path]] = None,
@@ -996,7 +1083,7 @@ class GeminiClient:
 
             # 配置参数
             aspect_ratio: 宽高比，默认 9:16（生成模式使用）
-            duration_seconds: 视频时长，可选 "4", "6", "8"（生成模式使用）
+            duration_seconds: 视频时长（秒），可选 4, 6, 8（生成模式使用）
             resolution: 分辨率，可选 "720p", "1080p", "4k"（延长模式强制 720p）
             negative_prompt: 负面提示词，指定不想要的元素（默认禁止 BGM）
             output_path: 本地输出路径
@@ -1094,8 +1181,10 @@ class GeminiClient:
             operation = await self.client.aio.operations.get(operation)
             print(f"视频{mode_text}中... 已等待 {elapsed} 秒")
 
-        return self._process_video_result(
-            operation, output_path, is_extend_mode, output_gcs_uri
+        # 下载与写盘（视频可达数十 MB）放到线程中，避免阻塞事件循环
+        return await asyncio.to_thread(
+            self._process_video_result,
+            operation, output_path, is_extend_mode, output_gcs_uri,
         )
 
     def _prepare_text_config(self, response_schema: Optional[Dict]) -> Optional[Dict]:
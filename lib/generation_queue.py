@@ -4,14 +4,15 @@ SQLite-backed generation task queue shared by WebUI and skills.
 
 from __future__ import annotations
 
+import copy
 import json
 import sqlite3
 import threading
 import time
 import uuid
-from datetime import datetime, timezone
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 ACTIVE_TASK_STATUSES = ("queued", "running")
 TERMINAL_TASK_STATUSES = ("succeeded", "failed")
@@ -20,6 +21,121 @@ TASK_WORKER_LEASE_TTL_SEC = 10.0
 TASK_WORKER_HEARTBEAT_SEC = 3.0
 TASK_SSE_HEARTBEAT_SEC = 15.0
 TASK_POLL_INTERVAL_SEC = 1.0
+TASK_WORKER_ONLINE_CACHE_SEC = 1.0
+TASK_TERMINAL_CACHE_SIZE = 1024
+# 批量查询时单条 SQL 的 IN 参数上限（低于 SQLite 默认变量上限）
+TASK_BULK_QUERY_CHUNK = 500
+TASK_QUEUE_STATEMENT_CACHE_SIZE = 256
+
+
+_TASK_COLUMNS = (
+    "task_id",
+    "project_name",
+    "task_type",
+    "media_type",
+    "resource_id",
+    "script_file",
+    "payload_json",
+    "status",
+    "result_json",
+    "error_message",
+    "source",
+    "queued_at",
+    "started_at",
+    "finished_at",
+    "updated_at",
+)
+
+# 事件关联任务行时使用的列前缀，避免与 task_events 同名列冲突
+_EVENT_TASK_PREFIX = "task__"
+_EVENT_TASK_JOIN_COLS = ", ".join(
+    f"t.{col} AS {_EVENT_TASK_PREFIX}{col}" for col in _TASK_COLUMNS
+)
+
+# 列表/快照的轻量列投影：不含 payload_json / result_json 等大字段
+_TASK_COLS_LIGHT = (
+    "task_id, project_name, task_type, media_type, resource_id, script_file, "
+    "status, error_message, source, queued_at, started_at, finished_at, updated_at"
+)
+
+
+def _build_list_tasks_sql() -> Dict[Tuple[bool, ...], Tuple[str, str, str]]:
+    """
+    预生成 list_tasks 各过滤组合的 SQL 文本。
+
+    key 为 (project_name, status, task_type, source) 是否生效的布尔元组，
+    value 为 (count_sql, select_sql, select_light_sql)。
+    """
+    filter_columns = ("project_name", "status", "task_type", "source")
+    templates: Dict[Tuple[bool, ...], Tuple[str, str, str]] = {}
+    for mask in range(1 << len(filter_columns)):
+        enabled = tuple(bool(mask & (1 << i)) for i in range(len(filter_columns)))
+        conditions = [
+            f"{column} = ?" for column, on in zip(filter_columns, enabled) if on
+        ]
+        where_clause = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        order_clause = "ORDER BY updated_at DESC, queued_at DESC LIMIT ? OFFSET ?"
+        templates[enabled] = (
+            f"SELECT COUNT(*) AS total FROM tasks {where_clause}".rstrip(),
+            f"SELECT * FROM tasks {where_clause}{order_clause}",
+            f"SELECT {_TASK_COLS_LIGHT} FROM tasks {where_clause}{order_clause}",
+        )
+    return templates
+
+
+_LIST_TASKS_SQL = _build_list_tasks_sql()
+
+
+# 建表 DDL 一次性 executescript 执行；PRAGMA user_version 达到 _SCHEMA_VERSION 后跳过
+_SCHEMA_VERSION = 2
+_SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    project_name TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    script_file TEXT,
+    payload_json TEXT,
+    status TEXT NOT NULL,
+    result_json TEXT,
+    error_message TEXT,
+    source TEXT NOT NULL DEFAULT 'webui',
+    queued_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS task_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data_json TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS worker_lease (
+    name TEXT PRIMARY KEY,
+    owner_id TEXT NOT NULL,
+    lease_until REAL NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status_queued_at ON tasks(status, queued_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_updated_at ON tasks(project_name, updated_at);
+CREATE INDEX IF NOT EXISTS idx_task_events_id ON task_events(id);
+CREATE INDEX IF NOT EXISTS idx_task_events_project_id ON task_events(project_name, id);
+
+-- Migrate dedupe key to include script_file so same segment_id across episodes
+-- is not treated as one active task.
+DROP INDEX IF EXISTS idx_tasks_dedupe_active;
+CREATE UNIQUE INDEX idx_tasks_dedupe_active
+ON tasks(project_name, task_type, resource_id, COALESCE(script_file, ''))
+WHERE status IN ('queued', 'running');
+"""
 
 
 _QUEUE_LOCK = threading.Lock()
@@ -27,14 +143,15 @@ _QUEUE_INSTANCE: Optional["GenerationQueue"] = None
 
 
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def _json_dumps(value: Any) -> str:
-    return json.dumps(value, ensure_ascii=False)
+    # 紧凑分隔符：减少 payload/result/event 行体积与 WAL 写入量
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
 
 
-def _json_loads(value: Optional[str], default: Any) -> Any:
+def _json_loads(value: Optional[Union[str, bytes]], default: Any) -> Any:
     if not value:
         return default
     try:
@@ -58,99 +175,118 @@ class GenerationQueue:
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = Path(db_path) if db_path else resolve_queue_db_path()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # 同进程内的入队监听（worker 注册后可立即唤醒，跨进程入队仍依赖轮询）
+        self._enqueue_listeners: List[Callable[[], None]] = []
+        # lease name -> (monotonic checked_at, is_online)；dict 单键读写在 GIL 下原子，无需加锁
+        self._worker_online_cache: Dict[str, Tuple[float, bool]] = {}
+        # 终态任务不再变化，按 task_id 做有界 LRU 缓存，省去重复查询
+        self._terminal_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._terminal_cache_lock = threading.Lock()
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        # 每个线程复用一条连接：sqlite3 的语句缓存按连接生效，复用后热点 SQL 无需重复 prepare
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            isolation_level=None,
+            cached_statements=TASK_QUEUE_STATEMENT_CACHE_SIZE,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA busy_timeout=30000")
         conn.execute("PRAGMA foreign_keys=OFF")
+        self._local.conn = conn
         return conn
 
     def _init_db(self) -> None:
         with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id TEXT PRIMARY KEY,
-                    project_name TEXT NOT NULL,
-                    task_type TEXT NOT NULL,
-                    media_type TEXT NOT NULL,
-                    resource_id TEXT NOT NULL,
-                    script_file TEXT,
-                    payload_json TEXT,
-                    status TEXT NOT NULL,
-                    result_json TEXT,
-                    error_message TEXT,
-                    source TEXT NOT NULL DEFAULT 'webui',
-                    queued_at TEXT NOT NULL,
-                    started_at TEXT,
-                    finished_at TEXT,
-                    updated_at TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS task_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT NOT NULL,
-                    project_name TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    data_json TEXT,
-                    created_at TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS worker_lease (
-                    name TEXT PRIMARY KEY,
-                    owner_id TEXT NOT NULL,
-                    lease_until REAL NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-                """
-            )
-
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tasks_status_queued_at ON tasks(status, queued_at)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tasks_project_updated_at ON tasks(project_name, updated_at)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_task_events_id ON task_events(id)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_task_events_project_id ON task_events(project_name, id)"
-            )
-            # Migrate dedupe key to include script_file so same segment_id across episodes
-            # is not treated as one active task.
-            conn.execute("DROP INDEX IF EXISTS idx_tasks_dedupe_active")
-            conn.execute(
-                """
-                CREATE UNIQUE INDEX idx_tasks_dedupe_active
-                ON tasks(project_name, task_type, resource_id, COALESCE(script_file, ''))
-                WHERE status IN ('queued', 'running')
-                """
-            )
+            row = conn.execute("PRAGMA user_version").fetchone()
+            if row and int(row[0]) >= _SCHEMA_VERSION:
+                return
+            conn.executescript(_SCHEMA_DDL)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def add_enqueue_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked (from the enqueuing thread) after a new task is queued."""
+        self._enqueue_listeners.append(listener)
+
+    def remove_enqueue_listener(self, listener: Callable[[], None]) -> None:
+        try:
+            self._enqueue_listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify_enqueue_listeners(self) -> None:
+        for listener in list(self._enqueue_listeners):
+            try:
+                listener()
+            except Exception:
+                # 监听方异常（如事件循环已关闭）不影响入队结果
+                pass
+
+    def _cache_terminal_task(self, task: Dict[str, Any]) -> None:
+        if task.get("status") not in TERMINAL_TASK_STATUSES:
+            return
+        with self._terminal_cache_lock:
+            self._terminal_cache[task["task_id"]] = copy.deepcopy(task)
+            self._terminal_cache.move_to_end(task["task_id"])
+            while len(self._terminal_cache) > TASK_TERMINAL_CACHE_SIZE:
+                self._terminal_cache.popitem(last=False)
+
+    def _get_cached_terminal_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._terminal_cache_lock:
+            task = self._terminal_cache.get(task_id)
+            if task is None:
+                return None
+            self._terminal_cache.move_to_end(task_id)
+            return copy.deepcopy(task)
 
     @staticmethod
     def _row_to_task_dict(row: sqlite3.Row) -> Dict[str, Any]:
-        task = dict(row)
-        task["payload"] = _json_loads(task.pop("payload_json", None), {})
-        task["result"] = _json_loads(task.pop("result_json", None), None)
+        # dict(zip(...)) 走按位置迭代，比 dict(row) 的按列名逐个取值更快
+        task = dict(zip(row.keys(), row))
+        # 轻量查询未选取 payload/result 列时，不输出对应字段
+        if "payload_json" in task:
+            task["payload"] = _json_loads(task.pop("payload_json"), {})
+        if "result_json" in task:
+            task["result"] = _json_loads(task.pop("result_json"), None)
         return task
 
     @staticmethod
     def _row_to_event_dict(row: sqlite3.Row) -> Dict[str, Any]:
-        event = dict(row)
+        event = dict(zip(row.keys(), row))
         event["data"] = _json_loads(event.pop("data_json", None), {})
+
+        # include_task 查询时，用关联到的完整任务行替换事件内的精简数据
+        task_fields = {
+            key[len(_EVENT_TASK_PREFIX):]: event.pop(key)
+            for key in list(event)
+            if key.startswith(_EVENT_TASK_PREFIX)
+        }
+        if task_fields.get("task_id") is not None:
+            task = dict(task_fields)
+            task["payload"] = _json_loads(task.pop("payload_json", None), {})
+            task["result"] = _json_loads(task.pop("result_json", None), None)
+            event["data"] = task
         return event
 
+    @staticmethod
+    def _event_data(task: Dict[str, Any]) -> Dict[str, Any]:
+        """事件只记录状态变化，完整任务行按需从 tasks 表关联读取。"""
+        return {
+            "task_id": task["task_id"],
+            "project_name": task["project_name"],
+            "status": task["status"],
+            "error_message": task.get("error_message"),
+            "updated_at": task["updated_at"],
+        }
+
     def _append_event_conn(
         self,
         conn: sqlite3.Connection,
@@ -160,8 +296,9 @@ class GenerationQueue:
         event_type: str,
         status: str,
         data: Optional[Dict[str, Any]] = None,
+        created_at: Optional[str] = None,
     ) -> int:
-        created_at = _utc_now_iso()
+        created_at = created_at or _utc_now_iso()
         cursor = conn.execute(
             """
             INSERT INTO task_events(task_id, project_name, event_type, status, data_json, created_at)
@@ -242,20 +379,24 @@ class GenerationQueue:
                     "existing_task_id": existing["task_id"],
                 }
 
-            task_row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            task_data = self._row_to_task_dict(task_row)
             self._append_event_conn(
                 conn,
                 task_id=task_id,
                 project_name=project_name,
                 event_type="queued",
                 status="queued",
-                data=task_data,
+                data={
+                    "task_id": task_id,
+                    "project_name": project_name,
+                    "status": "queued",
+                    "error_message": None,
+                    "updated_at": now,
+                },
+                created_at=now,
             )
             conn.execute("COMMIT")
 
+        self._notify_enqueue_listeners()
         return {
             "task_id": task_id,
             "status": "queued",
@@ -264,52 +405,66 @@ class GenerationQueue:
         }
 
     def claim_next_task(self, media_type: str) -> Optional[Dict[str, Any]]:
+        tasks = self.claim_next_tasks(media_type, limit=1)
+        return tasks[0] if tasks else None
+
+    def claim_next_tasks(self, media_type: str, limit: int) -> List[Dict[str, Any]]:
+        """Claim up to ``limit`` queued tasks (oldest first) in a single transaction."""
+        limit = int(limit)
+        if limit <= 0:
+            return []
         now = _utc_now_iso()
 
         with self._connect() as conn:
             conn.execute("BEGIN IMMEDIATE")
-            row = conn.execute(
+            rows = conn.execute(
                 """
                 SELECT *
                 FROM tasks
                 WHERE status = 'queued'
                   AND media_type = ?
                 ORDER BY queued_at ASC
-                LIMIT 1
+                LIMIT ?
                 """,
-                (media_type,),
-            ).fetchone()
+                (media_type, limit),
+            ).fetchall()
 
-            if not row:
+            if not rows:
                 conn.execute("COMMIT")
-                return None
+                return []
 
-            task_id = row["task_id"]
+            task_ids = [row["task_id"] for row in rows]
+            placeholders = ",".join("?" * len(task_ids))
             conn.execute(
-                """
+                f"""
                 UPDATE tasks
                 SET status = 'running',
                     started_at = COALESCE(started_at, ?),
                     updated_at = ?
-                WHERE task_id = ?
+                WHERE task_id IN ({placeholders})
                 """,
-                (now, now, task_id),
+                (now, now, *task_ids),
             )
 
-            running_row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            running_task = self._row_to_task_dict(running_row)
-            self._append_event_conn(
-                conn,
-                task_id=task_id,
-                project_name=running_task["project_name"],
-                event_type="running",
-                status="running",
-                data=running_task,
-            )
+            running_tasks: List[Dict[str, Any]] = []
+            for row in rows:
+                # 直接按 UPDATE 语义补齐字段，无需再次 SELECT
+                running_task = self._row_to_task_dict(row)
+                running_task["status"] = "running"
+                running_task["started_at"] = running_task.get("started_at") or now
+                running_task["updated_at"] = now
+                self._append_event_conn(
+                    conn,
+                    task_id=running_task["task_id"],
+                    project_name=running_task["project_name"],
+                    event_type="running",
+                    status="running",
+                    data=self._event_data(running_task),
+                    created_at=now,
+                )
+                running_tasks.append(running_task)
             conn.execute("COMMIT")
-            return running_task
+            return running_tasks
 
     def requeue_running_tasks(self, *, limit: int = 1000) -> int:
         """Requeue tasks stuck in running state (e.g. previous worker crashed)."""
@@ -361,26 +516,28 @@ class GenerationQueue:
                     project_name=task_data["project_name"],
                     event_type="requeued",
                     status="queued",
-                    data=task_data,
+                    data=self._event_data(task_data),
+                    created_at=now,
                 )
                 recovered += 1
 
             conn.execute("COMMIT")
-            return recovered
+        if recovered:
+            with self._terminal_cache_lock:
+                self._terminal_cache.clear()
+        return recovered
 
-    def mark_task_succeeded(self, task_id: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        now = _utc_now_iso()
-
-        with self._connect() as conn:
-            conn.execute("BEGIN IMMEDIATE")
-            row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            if not row:
-                conn.execute("COMMIT")
-                return None
-
-            conn.execute(
+    def _finish_task_conn(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        succeeded: bool,
+        value: Any,
+        now: str,
+    ) -> Optional[Dict[str, Any]]:
+        """在调用方事务内把任务置为 succeeded/failed 并追加事件"""
+        if succeeded:
+            cursor = conn.execute(
                 """
                 UPDATE tasks
                 SET status = 'succeeded',
@@ -390,37 +547,10 @@ class GenerationQueue:
                     updated_at = ?
                 WHERE task_id = ?
                 """,
-                (_json_dumps(result or {}), now, now, task_id),
-            )
-
-            done_row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            done_task = self._row_to_task_dict(done_row)
-            self._append_event_conn(
-                conn,
-                task_id=task_id,
-                project_name=done_task["project_name"],
-                event_type="succeeded",
-                status="succeeded",
-                data=done_task,
+                (_json_dumps(value or {}), now, now, task_id),
             )
-            conn.execute("COMMIT")
-            return done_task
-
-    def mark_task_failed(self, task_id: str, error_message: str) -> Optional[Dict[str, Any]]:
-        now = _utc_now_iso()
-
-        with self._connect() as conn:
-            conn.execute("BEGIN IMMEDIATE")
-            row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            if not row:
-                conn.execute("COMMIT")
-                return None
-
-            conn.execute(
+        else:
+            cursor = conn.execute(
                 """
                 UPDATE tasks
                 SET status = 'failed',
@@ -429,32 +559,112 @@ class GenerationQueue:
                     updated_at = ?
                 WHERE task_id = ?
                 """,
-                (error_message[:2000], now, now, task_id),
+                (str(value)[:2000], now, now, task_id),
             )
+        if cursor.rowcount == 0:
+            return None
+
+        done_row = conn.execute(
+            "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        done_task = self._row_to_task_dict(done_row)
+        status = done_task["status"]
+        self._append_event_conn(
+            conn,
+            task_id=task_id,
+            project_name=done_task["project_name"],
+            event_type=status,
+            status=status,
+            data=self._event_data(done_task),
+            created_at=now,
+        )
+        return done_task
 
-            failed_row = conn.execute(
-                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-            ).fetchone()
-            failed_task = self._row_to_task_dict(failed_row)
-            self._append_event_conn(
-                conn,
-                task_id=task_id,
-                project_name=failed_task["project_name"],
-                event_type="failed",
-                status="failed",
-                data=failed_task,
-            )
+    def mark_task_results_bulk(
+        self, results: Sequence[Tuple[str, bool, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        在一个事务内批量写入任务结果。
+
+        ``results`` 中每项为 ``(task_id, succeeded, result_or_error_message)``；
+        返回实际更新的任务（不存在的 task_id 被忽略）。
+        """
+        if not results:
+            return []
+        now = _utc_now_iso()
+
+        finished: List[Dict[str, Any]] = []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for task_id, succeeded, value in results:
+                done_task = self._finish_task_conn(conn, task_id, succeeded, value, now)
+                if done_task is not None:
+                    finished.append(done_task)
             conn.execute("COMMIT")
-            return failed_task
+        for done_task in finished:
+            self._cache_terminal_task(done_task)
+        return finished
+
+    def mark_task_succeeded(self, task_id: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        finished = self.mark_task_results_bulk([(task_id, True, result)])
+        return finished[0] if finished else None
+
+    def mark_task_failed(self, task_id: str, error_message: str) -> Optional[Dict[str, Any]]:
+        finished = self.mark_task_results_bulk([(task_id, False, error_message)])
+        return finished[0] if finished else None
 
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._get_cached_terminal_task(task_id)
+        if cached is not None:
+            return cached
+
         with self._connect() as conn:
             row = conn.execute(
                 "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
             ).fetchone()
             if not row:
                 return None
-            return self._row_to_task_dict(row)
+            task = self._row_to_task_dict(row)
+        self._cache_terminal_task(task)
+        return task
+
+    def get_tasks(self, task_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch many tasks in chunked ``IN`` queries; returns ``{task_id: task}``."""
+        tasks: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for task_id in dict.fromkeys(task_ids):
+            cached = self._get_cached_terminal_task(task_id)
+            if cached is not None:
+                tasks[task_id] = cached
+            else:
+                missing.append(task_id)
+
+        if not missing:
+            return tasks
+
+        with self._connect() as conn:
+            for start in range(0, len(missing), TASK_BULK_QUERY_CHUNK):
+                chunk = missing[start:start + TASK_BULK_QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT * FROM tasks WHERE task_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    task = self._row_to_task_dict(row)
+                    self._cache_terminal_task(task)
+                    tasks[task["task_id"]] = task
+        return tasks
+
+    def get_task_status(self, task_id: str) -> Optional[str]:
+        """Return only the task status (cheap poll, skips payload/result parsing)."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if not row:
+                return None
+            return row["status"]
 
     def list_tasks(
         self,
@@ -465,45 +675,24 @@ class GenerationQueue:
         source: Optional[str] = None,
         page: int = 1,
         page_size: int = 50,
+        light: bool = False,
     ) -> Dict[str, Any]:
         page = max(1, int(page))
         page_size = max(1, min(500, int(page_size)))
         offset = (page - 1) * page_size
 
-        conditions: List[str] = []
-        params: List[Any] = []
-
-        if project_name:
-            conditions.append("project_name = ?")
-            params.append(project_name)
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
-        if task_type:
-            conditions.append("task_type = ?")
-            params.append(task_type)
-        if source:
-            conditions.append("source = ?")
-            params.append(source)
-
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
+        filters = (project_name, status, task_type, source)
+        count_sql, select_sql, select_light_sql = _LIST_TASKS_SQL[
+            tuple(bool(value) for value in filters)
+        ]
+        params = [value for value in filters if value]
 
         with self._connect() as conn:
-            count_row = conn.execute(
-                f"SELECT COUNT(*) AS total FROM tasks {where_clause}", params
-            ).fetchone()
+            count_row = conn.execute(count_sql, params).fetchone()
             total = int(count_row["total"]) if count_row else 0
 
             rows = conn.execute(
-                f"""
-                SELECT *
-                FROM tasks
-                {where_clause}
-                ORDER BY updated_at DESC, queued_at DESC
-                LIMIT ? OFFSET ?
-                """,
+                select_light_sql if light else select_sql,
                 [*params, page_size, offset],
             ).fetchall()
 
@@ -554,8 +743,10 @@ class GenerationQueue:
         *,
         project_name: Optional[str] = None,
         limit: int = 200,
+        light: bool = False,
     ) -> List[Dict[str, Any]]:
         limit = max(1, min(1000, int(limit)))
+        columns = _TASK_COLS_LIGHT if light else "*"
         where_clause = ""
         params: List[Any] = []
         if project_name:
@@ -565,7 +756,7 @@ class GenerationQueue:
         with self._connect() as conn:
             rows = conn.execute(
                 f"""
-                SELECT *
+                SELECT {columns}
                 FROM tasks
                 {where_clause}
                 ORDER BY updated_at DESC
@@ -582,22 +773,36 @@ class GenerationQueue:
         last_event_id: int,
         project_name: Optional[str] = None,
         limit: int = 200,
+        include_task: bool = False,
     ) -> List[Dict[str, Any]]:
+        """
+        Read events after ``last_event_id``.
+
+        Events only store a status diff; pass ``include_task=True`` to join the
+        current task row into ``event["data"]`` (used by the SSE stream).
+        """
         limit = max(1, min(1000, int(limit)))
         params: List[Any] = [int(last_event_id)]
 
-        where_clause = "WHERE id > ?"
+        where_clause = "WHERE e.id > ?"
         if project_name:
-            where_clause += " AND project_name = ?"
+            where_clause += " AND e.project_name = ?"
             params.append(project_name)
 
+        columns = "e.*"
+        join_clause = ""
+        if include_task:
+            columns = f"e.*, {_EVENT_TASK_JOIN_COLS}"
+            join_clause = "LEFT JOIN tasks t ON t.task_id = e.task_id"
+
         with self._connect() as conn:
             rows = conn.execute(
                 f"""
-                SELECT *
-                FROM task_events
+                SELECT {columns}
+                FROM task_events e
+                {join_clause}
                 {where_clause}
-                ORDER BY id ASC
+                ORDER BY e.id ASC
                 LIMIT ?
                 """,
                 [*params, limit],
@@ -632,42 +837,24 @@ class GenerationQueue:
         now_epoch = time.time()
         lease_until = now_epoch + max(1.0, float(ttl_seconds))
         updated_at = _utc_now_iso()
+        self._worker_online_cache.pop(name, None)
 
+        # 单条 UPSERT：无记录则插入；仅当本实例持有或已过期时才覆盖，否则不改动（rowcount 为 0）
         with self._connect() as conn:
-            conn.execute("BEGIN IMMEDIATE")
-            row = conn.execute(
-                "SELECT owner_id, lease_until FROM worker_lease WHERE name = ?",
-                (name,),
-            ).fetchone()
-
-            if not row:
-                conn.execute(
-                    """
-                    INSERT INTO worker_lease(name, owner_id, lease_until, updated_at)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (name, owner_id, lease_until, updated_at),
-                )
-                conn.execute("COMMIT")
-                return True
-
-            lease_owner = row["owner_id"]
-            lease_expired = float(row["lease_until"]) <= now_epoch
-
-            if lease_owner == owner_id or lease_expired:
-                conn.execute(
-                    """
-                    UPDATE worker_lease
-                    SET owner_id = ?, lease_until = ?, updated_at = ?
-                    WHERE name = ?
-                    """,
-                    (owner_id, lease_until, updated_at, name),
-                )
-                conn.execute("COMMIT")
-                return True
-
-            conn.execute("COMMIT")
-            return False
+            cursor = conn.execute(
+                """
+                INSERT INTO worker_lease(name, owner_id, lease_until, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner_id = excluded.owner_id,
+                    lease_until = excluded.lease_until,
+                    updated_at = excluded.updated_at
+                WHERE worker_lease.owner_id = excluded.owner_id
+                   OR worker_lease.lease_until <= ?
+                """,
+                (name, owner_id, lease_until, updated_at, now_epoch),
+            )
+            return cursor.rowcount > 0
 
     def release_worker_lease(self, *, name: str, owner_id: str) -> None:
         with self._connect() as conn:
@@ -675,17 +862,22 @@ class GenerationQueue:
                 "DELETE FROM worker_lease WHERE name = ? AND owner_id = ?",
                 (name, owner_id),
             )
+        self._worker_online_cache.pop(name, None)
 
     def is_worker_online(self, *, name: str = "default") -> bool:
+        cached = self._worker_online_cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < TASK_WORKER_ONLINE_CACHE_SEC:
+            return cached[1]
+
         now_epoch = time.time()
         with self._connect() as conn:
             row = conn.execute(
                 "SELECT lease_until FROM worker_lease WHERE name = ?",
                 (name,),
             ).fetchone()
-            if not row:
-                return False
-            return float(row["lease_until"]) > now_epoch
+        online = bool(row) and float(row["lease_until"]) > now_epoch
+        self._worker_online_cache[name] = (time.monotonic(), online)
+        return online
 
     def get_worker_lease(self, *, name: str = "default") -> Optional[Dict[str, Any]]:
         with self._connect() as conn:
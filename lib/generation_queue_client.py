@@ -5,10 +5,11 @@ Helper utilities for skills to enqueue-and-wait generation tasks.
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Sequence
 
 from lib.generation_queue import (
     TASK_WORKER_LEASE_TTL_SEC,
+    TERMINAL_TASK_STATUSES,
     get_generation_queue,
     read_queue_poll_interval,
 )
@@ -51,14 +52,15 @@ def is_worker_online(lease_name: str = "default") -> bool:
     return queue.is_worker_online(name=lease_name)
 
 
-def wait_for_task(
-    task_id: str,
-    poll_interval: Optional[float] = None,
-    *,
-    timeout_seconds: Optional[float] = None,
-    lease_name: str = "default",
-    worker_offline_grace_seconds: Optional[float] = None,
-) -> Dict[str, Any]:
+def _poll_until_done(
+    poll: Callable[[], Optional[Any]],
+    description: str,
+    poll_interval: Optional[float],
+    timeout_seconds: Optional[float],
+    lease_name: str,
+    worker_offline_grace_seconds: Optional[float],
+) -> Any:
+    """按间隔调用 poll 直到其返回非 None；统一处理超时与 worker 离线判断。"""
     queue = get_generation_queue()
     interval = poll_interval if poll_interval is not None else read_queue_poll_interval()
     timeout = read_task_wait_timeout() if timeout_seconds is None else timeout_seconds
@@ -73,18 +75,14 @@ def wait_for_task(
     offline_since: Optional[float] = None
 
     while True:
-        task = queue.get_task(task_id)
-        if not task:
-            raise RuntimeError(f"task not found: {task_id}")
-
-        status = task.get("status")
-        if status in ("succeeded", "failed"):
-            return task
+        done = poll()
+        if done is not None:
+            return done
 
         now = time.monotonic()
         if timeout is not None and now - start >= timeout:
             raise TaskWaitTimeoutError(
-                f"timed out waiting for task '{task_id}' after {timeout:.1f}s"
+                f"timed out waiting for {description} after {timeout:.1f}s"
             )
 
         if queue.is_worker_online(name=lease_name):
@@ -94,12 +92,83 @@ def wait_for_task(
                 offline_since = now
             elif now - offline_since >= offline_grace:
                 raise WorkerOfflineError(
-                    f"queue worker offline while waiting for task '{task_id}'"
+                    f"queue worker offline while waiting for {description}"
                 )
 
         time.sleep(interval)
 
 
+def wait_for_task(
+    task_id: str,
+    poll_interval: Optional[float] = None,
+    *,
+    timeout_seconds: Optional[float] = None,
+    lease_name: str = "default",
+    worker_offline_grace_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    queue = get_generation_queue()
+
+    def poll() -> Optional[Dict[str, Any]]:
+        # 轮询只读 status，终态时再取完整任务行
+        status = queue.get_task_status(task_id)
+        if status is None:
+            raise RuntimeError(f"task not found: {task_id}")
+        if status not in TERMINAL_TASK_STATUSES:
+            return None
+        task = queue.get_task(task_id)
+        if not task:
+            raise RuntimeError(f"task not found: {task_id}")
+        return task
+
+    return _poll_until_done(
+        poll,
+        f"task '{task_id}'",
+        poll_interval,
+        timeout_seconds,
+        lease_name,
+        worker_offline_grace_seconds,
+    )
+
+
+def wait_for_tasks(
+    task_ids: Sequence[str],
+    poll_interval: Optional[float] = None,
+    *,
+    timeout_seconds: Optional[float] = None,
+    lease_name: str = "default",
+    worker_offline_grace_seconds: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    等待多个任务全部进入终态，返回 ``{task_id: task}``（含 failed 任务，不抛 TaskFailedError）。
+
+    每轮只用一次 get_tasks 批量查询仍未结束的任务，取代逐个 wait_for_task 的 N 次轮询。
+    """
+    queue = get_generation_queue()
+    finished: Dict[str, Dict[str, Any]] = {}
+    pending = list(dict.fromkeys(task_ids))
+
+    def poll() -> Optional[Dict[str, Dict[str, Any]]]:
+        nonlocal pending
+        tasks = queue.get_tasks(pending)
+        missing = [task_id for task_id in pending if task_id not in tasks]
+        if missing:
+            raise RuntimeError(f"task not found: {', '.join(missing)}")
+        for task_id, task in tasks.items():
+            if task["status"] in TERMINAL_TASK_STATUSES:
+                finished[task_id] = task
+        pending = [task_id for task_id in pending if task_id not in finished]
+        return None if pending else finished
+
+    return _poll_until_done(
+        poll,
+        f"{len(pending)} tasks",
+        poll_interval,
+        timeout_seconds,
+        lease_name,
+        worker_offline_grace_seconds,
+    )
+
+
 def enqueue_and_wait(
     *,
     project_name: str,
@@ -5,9 +5,11 @@ Background worker that consumes generation tasks from SQLite queue.
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
 import uuid
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Dict, List, Tuple
 
 from lib.generation_queue import (
     GenerationQueue,
@@ -17,6 +19,8 @@ from lib.generation_queue import (
     get_generation_queue,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _read_int_env(name: str, default: int, minimum: int = 1) -> int:
     raw = os.environ.get(name)
@@ -29,9 +33,26 @@ def _read_int_env(name: str, default: int, minimum: int = 1) -> int:
     return max(minimum, value)
 
 
+def _create_eager_task(coro: Coroutine[Any, Any, None], *, name: str) -> asyncio.Task:
+    """
+    创建立即执行到首个 await 的任务（Python 3.12+），省去一次事件循环调度。
+
+    仅作用于 worker 自身派发的任务，不修改整个事件循环的 task factory。
+    """
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is None:
+        return asyncio.create_task(coro, name=name)
+    return eager_task_factory(asyncio.get_running_loop(), coro, name=name)
+
+
 class GenerationWorker:
     """Queue worker with separate image/video lanes and single-active lease."""
 
+    # 批量写入任务结果失败时的重试退避（秒）；停止时最多再尝试 FLUSH_MAX_ATTEMPTS_ON_STOP 次
+    FLUSH_RETRY_INITIAL_SEC = 0.5
+    FLUSH_RETRY_MAX_SEC = 30.0
+    FLUSH_MAX_ATTEMPTS_ON_STOP = 3
+
     def __init__(
         self,
         queue: GenerationQueue | None = None,
@@ -49,91 +70,175 @@ class GenerationWorker:
 
         self._main_task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
+        self._wakeup_event = asyncio.Event()
+        self._enqueue_listener: Callable[[], None] | None = None
         self._image_inflight: Dict[str, asyncio.Task] = {}
         self._video_inflight: Dict[str, asyncio.Task] = {}
         self._owns_lease = False
+        self._executor: ThreadPoolExecutor | None = None
+        # 任务结果 (task_id, succeeded, result_or_error)，由 flusher 合并成一个事务写入
+        self._completion_queue: asyncio.Queue[Tuple[str, bool, Any] | None] = asyncio.Queue()
+        self._completion_flusher: asyncio.Task | None = None
+        # 已从 _completion_queue 取出但尚未写入成功的结果数（写入重试期间不为 0）
+        self._unwritten_results = 0
 
     async def start(self) -> None:
         if self._main_task and not self._main_task.done():
             return
         self._stop_event.clear()
+        self._wakeup_event.clear()
+
+        # 生成任务以网络 I/O 为主（期间释放 GIL），用与两条通道槽位数相同的专用线程池，
+        # 避免与 asyncio.to_thread 共享默认线程池时被其他阻塞调用占满
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.image_workers + self.video_workers,
+                thread_name_prefix="generation-task",
+            )
+
+        loop = asyncio.get_running_loop()
+        self._enqueue_listener = lambda: loop.call_soon_threadsafe(self._wakeup_event.set)
+        self.queue.add_enqueue_listener(self._enqueue_listener)
+
+        self._completion_flusher = asyncio.create_task(
+            self._flush_completions(), name="generation-worker-completions"
+        )
         self._main_task = asyncio.create_task(self._run_loop(), name="generation-worker")
 
     async def stop(self) -> None:
         self._stop_event.set()
+        self._wakeup_event.set()
         if self._main_task:
             await self._main_task
             self._main_task = None
 
     async def _run_loop(self) -> None:
+        self._renew_lease()
+        heartbeat = asyncio.create_task(
+            self._lease_heartbeat(), name="generation-worker-lease"
+        )
         try:
             while not self._stop_event.is_set():
-                had_lease = self._owns_lease
-                self._owns_lease = self.queue.acquire_or_renew_worker_lease(
-                    name=self.lease_name,
-                    owner_id=self.owner_id,
-                    ttl_seconds=self.lease_ttl,
-                )
-
-                await self._drain_finished_tasks()
-
-                # 仅在“新获得 lease 且本实例无在途任务”时回收 running 任务，
-                # 避免 lease 短暂抖动时把自己正在执行的任务错误回队。
-                if (
-                    self._owns_lease
-                    and not had_lease
-                    and not self._image_inflight
-                    and not self._video_inflight
-                ):
-                    self.queue.requeue_running_tasks()
+                if heartbeat.done():
+                    # 心跳协程意外退出后无法保证 lease 有效，停止领取，避免任务被其他 worker 重复执行
+                    logger.error("generation worker lease heartbeat stopped; worker loop exiting")
+                    break
 
                 if not self._owns_lease:
-                    await asyncio.sleep(self.heartbeat_interval)
+                    # 等待心跳协程获得 lease（获得后会唤醒本循环）
+                    await self._wait_for_wakeup(self.heartbeat_interval)
                     continue
 
                 claimed_any = False
 
-                while len(self._image_inflight) < self.image_workers:
-                    task = self.queue.claim_next_task(media_type="image")
-                    if not task:
-                        break
+                # 每条通道按空闲槽位数一次性批量领取
+                image_slots = self.image_workers - len(self._image_inflight)
+                for task in self.queue.claim_next_tasks(media_type="image", limit=image_slots):
                     claimed_any = True
-                    self._image_inflight[task["task_id"]] = asyncio.create_task(
-                        self._process_task(task),
-                        name=f"generation-image-{task['task_id']}",
+                    self._track_inflight(
+                        self._image_inflight,
+                        task["task_id"],
+                        _create_eager_task(
+                            self._process_task(task),
+                            name=f"generation-image-{task['task_id']}",
+                        ),
                     )
 
-                while len(self._video_inflight) < self.video_workers:
-                    task = self.queue.claim_next_task(media_type="video")
-                    if not task:
-                        break
+                video_slots = self.video_workers - len(self._video_inflight)
+                for task in self.queue.claim_next_tasks(media_type="video", limit=video_slots):
                     claimed_any = True
-                    self._video_inflight[task["task_id"]] = asyncio.create_task(
-                        self._process_task(task),
-                        name=f"generation-video-{task['task_id']}",
+                    self._track_inflight(
+                        self._video_inflight,
+                        task["task_id"],
+                        _create_eager_task(
+                            self._process_task(task),
+                            name=f"generation-video-{task['task_id']}",
+                        ),
                     )
 
                 if claimed_any:
-                    await asyncio.sleep(0.05)
+                    # 仅让出事件循环；无空闲槽位时下一轮领取为空，会转入等待
+                    await asyncio.sleep(0)
                 else:
-                    await asyncio.sleep(self.poll_interval)
+                    await self._wait_for_wakeup(self.poll_interval)
 
             await self._wait_inflight_completion()
         finally:
+            await self._stop_completion_flusher()
+            heartbeat.cancel()
+            try:
+                await heartbeat
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("generation worker lease heartbeat failed")
+            if self._enqueue_listener is not None:
+                self.queue.remove_enqueue_listener(self._enqueue_listener)
+                self._enqueue_listener = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
             if self._owns_lease:
                 self.queue.release_worker_lease(name=self.lease_name, owner_id=self.owner_id)
             self._owns_lease = False
 
-    async def _drain_finished_tasks(self) -> None:
-        for inflight in (self._image_inflight, self._video_inflight):
-            done_ids = [task_id for task_id, task in inflight.items() if task.done()]
-            for task_id in done_ids:
-                task = inflight.pop(task_id)
-                try:
-                    await task
-                except Exception:
-                    # _process_task already persisted failure, swallow to keep loop alive.
-                    pass
+    def _renew_lease(self) -> None:
+        had_lease = self._owns_lease
+        try:
+            owns_lease = self.queue.acquire_or_renew_worker_lease(
+                name=self.lease_name,
+                owner_id=self.owner_id,
+                ttl_seconds=self.lease_ttl,
+            )
+            if owns_lease and not had_lease:
+                # 仅在“新获得 lease 且本实例无在途任务”时回收 running 任务，
+                # 避免 lease 短暂抖动时把自己正在执行的任务错误回队。
+                if (
+                    not self._image_inflight
+                    and not self._video_inflight
+                    and self._completion_queue.empty()
+                    and not self._unwritten_results
+                ):
+                    self.queue.requeue_running_tasks()
+        except Exception:
+            # 续租或回收失败时按未持有处理，停止领取新任务，下个心跳重试（含回收）。
+            logger.exception("generation worker failed to renew lease %r", self.lease_name)
+            self._owns_lease = False
+            return
+
+        self._owns_lease = owns_lease
+        if owns_lease and not had_lease:
+            self._wakeup_event.set()
+
+    async def _lease_heartbeat(self) -> None:
+        """按心跳间隔续租 lease，与任务领取解耦。"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._renew_lease()
+
+    async def _wait_for_wakeup(self, timeout: float) -> None:
+        """等待同进程入队/任务完成的唤醒信号，超时后回退为一次常规轮询。"""
+        try:
+            await asyncio.wait_for(self._wakeup_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup_event.clear()
+
+    @staticmethod
+    def _track_inflight(
+        inflight: Dict[str, asyncio.Task], task_id: str, task: asyncio.Task
+    ) -> None:
+        """登记在途任务，完成时由回调自动移除（取代每轮遍历扫描）。"""
+        inflight[task_id] = task
+
+        def _on_done(done: asyncio.Task) -> None:
+            if inflight.get(task_id) is done:
+                inflight.pop(task_id, None)
+            if not done.cancelled():
+                # _process_task already persisted failure, swallow to keep loop alive.
+                done.exception()
+
+        task.add_done_callback(_on_done)
 
     async def _wait_inflight_completion(self) -> None:
         pending_tasks = [*self._image_inflight.values(), *self._video_inflight.values()]
@@ -148,7 +253,70 @@ class GenerationWorker:
         try:
             from webui.server.services.generation_tasks import execute_generation_task
 
-            result = await asyncio.to_thread(execute_generation_task, task)
-            self.queue.mark_task_succeeded(task_id, result)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, execute_generation_task, task)
+            self._completion_queue.put_nowait((task_id, True, result))
         except Exception as exc:
-            self.queue.mark_task_failed(task_id, str(exc))
+            self._completion_queue.put_nowait((task_id, False, str(exc)))
+        finally:
+            # 释放出空闲槽位，唤醒主循环领取下一个任务
+            self._wakeup_event.set()
+
+    async def _flush_completions(self) -> None:
+        """取出当前已积压的全部结果，一次事务批量写入；收到 None 时写完剩余结果后退出。"""
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[str, bool, Any]] = []
+            item = await self._completion_queue.get()
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                try:
+                    item = self._completion_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            if batch:
+                await self._write_results_with_retry(batch, stopping)
+
+    async def _write_results_with_retry(
+        self, batch: List[Tuple[str, bool, Any]], stopping: bool
+    ) -> None:
+        """写入一批结果，失败时按指数退避重试，成功前不取新的结果。
+
+        持有 lease 的 worker 不会重新获得 lease，也就不会回收自己的 running 任务，
+        因此不能丢弃失败的批次；仅在停止阶段重试耗尽时放弃（lease 释放后由下一个 worker 回队）。
+        """
+        delay = self.FLUSH_RETRY_INITIAL_SEC
+        attempts = 0
+        self._unwritten_results += len(batch)
+        try:
+            while True:
+                try:
+                    self.queue.mark_task_results_bulk(batch)
+                    return
+                except Exception:
+                    attempts += 1
+                    logger.exception(
+                        "generation worker failed to write %d task result(s) (attempt %d)",
+                        len(batch),
+                        attempts,
+                    )
+                    if (stopping or self._stop_event.is_set()) and attempts >= self.FLUSH_MAX_ATTEMPTS_ON_STOP:
+                        logger.error(
+                            "generation worker giving up on task results: %s",
+                            ", ".join(task_id for task_id, _, _ in batch),
+                        )
+                        return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.FLUSH_RETRY_MAX_SEC)
+        finally:
+            self._unwritten_results -= len(batch)
+
+    async def _stop_completion_flusher(self) -> None:
+        if self._completion_flusher is None:
+            return
+        self._completion_queue.put_nowait(None)
+        await self._completion_flusher
+        self._completion_flusher = None
@@ -6,26 +6,67 @@ Currently used by WebUI upload endpoints to normalize uploaded images into PNG.
 
 from __future__ import annotations
 
+import asyncio
 from io import BytesIO
 
 from PIL import Image, ImageOps
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_EXIF_ORIENTATION_TAG = 0x0112
+
+# 上传图只做归一化存储，zlib 低压缩级别编码更快（体积略大）
+PNG_COMPRESS_LEVEL = 1
+
+# PNG 可直接存储的 8-bit 模式，保留原模式避免灰度图被放大为 RGBA
+_PNG_NATIVE_MODES = ("RGB", "RGBA", "L", "LA")
+
+
+def _normalize_mode(img: Image.Image) -> Image.Image:
+    if img.mode in _PNG_NATIVE_MODES:
+        return img
+    if img.mode == "P":
+        return img.convert("RGBA" if "transparency" in img.info else "RGB")
+    if img.mode in ("1", "I", "F"):
+        return img.convert("L")
+    return img.convert("RGBA")
+
+
+def _is_passthrough_png(img: Image.Image) -> bool:
+    """已是 8-bit RGB/RGBA/L/LA PNG 且无需按 EXIF 旋转时，可直接沿用原始字节。"""
+    if img.format != "PNG" or img.mode not in _PNG_NATIVE_MODES:
+        return False
+    exif = img.info.get("exif")
+    if not exif:
+        return True
+    orientation = Image.Exif()
+    orientation.load(exif)
+    return orientation.get(_EXIF_ORIENTATION_TAG, 1) == 1
+
 
 def convert_image_bytes_to_png(content: bytes) -> bytes:
     """
     Convert arbitrary image bytes (jpg/png/webp/...) into PNG bytes.
 
+    PNG inputs that are already 8-bit RGB/RGBA/L/LA and upright are returned
+    unchanged; other modes are converted to the narrowest equivalent PNG mode.
+
     Raises:
         ValueError: if the input bytes are not a valid image.
     """
     try:
         with Image.open(BytesIO(content)) as img:
-            img = ImageOps.exif_transpose(img)
-            if img.mode not in ("RGB", "RGBA"):
-                img = img.convert("RGBA")
+            if content[:8] == _PNG_SIGNATURE and _is_passthrough_png(img):
+                # open 只解析头部，需完整解码一次以拒绝截断/损坏的 PNG；省掉的是重新编码
+                img.load()
+                return content
+            img = _normalize_mode(ImageOps.exif_transpose(img))
             out = BytesIO()
-            img.save(out, format="PNG")
+            img.save(out, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
             return out.getvalue()
     except Exception as e:
         raise ValueError("Invalid image") from e
 
+
+async def convert_image_bytes_to_png_async(content: bytes) -> bytes:
+    """Async wrapper of convert_image_bytes_to_png; runs decode/encode in a worker thread."""
+    return await asyncio.to_thread(convert_image_bytes_to_png, content)
@@ -11,6 +11,7 @@ MediaGenerator 中间层
 - clues: 线索设计图 (玉佩.png)
 """
 
+import asyncio
 from pathlib import Path
 from typing import Optional, List, Union, Tuple
 from PIL import Image
@@ -56,6 +57,15 @@ class MediaGenerator:
         db_path = self.project_path.parent / ".api_usage.db"
         self.usage_tracker = UsageTracker(db_path)
 
+        # 预先拆分输出路径模式为 (目录, 文件名前缀, 后缀)，生成时只需拼接文件名
+        self._output_targets = {}
+        for resource_type, pattern in self.OUTPUT_PATTERNS.items():
+            directory, _, filename = pattern.rpartition('/')
+            prefix, _, suffix = filename.partition('{resource_id}')
+            self._output_targets[resource_type] = (self.project_path / directory, prefix, suffix)
+        # 已确认存在的输出目录，避免每次生成都 stat/mkdir
+        self._known_dirs = set()
+
     def _get_output_path(self, resource_type: str, resource_id: str) -> Path:
         """
         根据资源类型和 ID 推断输出路径
@@ -67,16 +77,19 @@ class MediaGenerator:
         Returns:
             输出文件的绝对路径
         """
-        if resource_type not in self.OUTPUT_PATTERNS:
-            raise ValueError(f"不支持的资源类型: {resource_type}")
-
-        pattern = self.OUTPUT_PATTERNS[resource_type]
-        relative_path = pattern.format(resource_id=resource_id)
-        return self.project_path / relative_path
+        try:
+            directory, prefix, suffix = self._output_targets[resource_type]
+        except KeyError:
+            raise ValueError(f"不支持的资源类型: {resource_type}") from None
+        return directory / f"{prefix}{resource_id}{suffix}"
 
     def _ensure_parent_dir(self, output_path: Path) -> None:
         """确保输出目录存在"""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = output_path.parent
+        if parent in self._known_dirs:
+            return
+        parent.mkdir(parents=True, exist_ok=True)
+        self._known_dirs.add(parent)
 
     def generate_image(
         self,
@@ -93,9 +106,9 @@ class MediaGenerator:
 
         版本管理逻辑：
         1. 检查 output_path 是否存在
-        2. 若存在 → 调用 ensure_current_tracked() 确保旧文件被记录
+        2. 若存在 → 调用 stage_current_for_tracking() 暂存未记录的旧文件
         3. 调用 GeminiClient 生成新文件
-        4. 调用 add_version() 记录新版本
+        4. 调用 record_generation() 一次性记录暂存的旧文件与新版本
         5. 返回结果
 
         Args:
@@ -113,9 +126,10 @@ class MediaGenerator:
         output_path = self._get_output_path(resource_type, resource_id)
         self._ensure_parent_dir(output_path)
 
-        # 1. 若已存在，确保旧文件被记录
-        if output_path.exists():
-            self.versions.ensure_current_tracked(
+        # 1. 若已存在且尚无版本记录，暂存旧文件
+        staged_current = None
+        if output_path.exists() and not self.versions.is_current_tracked(resource_type, resource_id):
+            staged_current = self.versions.stage_current_for_tracking(
                 resource_type=resource_type,
                 resource_id=resource_id,
                 current_file=output_path,
@@ -157,13 +171,15 @@ class MediaGenerator:
                 status="failed",
                 error_message=str(e),
             )
+            self.versions.discard_staged(staged_current)
             raise
 
-        # 5. 记录新版本
-        new_version = self.versions.add_version(
+        # 5. 记录新版本（连同暂存的旧文件）
+        new_version = self.versions.record_generation(
             resource_type=resource_type,
             resource_id=resource_id,
             prompt=prompt,
+            staged_current=staged_current,
             source_file=output_path,
             aspect_ratio=aspect_ratio,
             **version_metadata
@@ -199,26 +215,36 @@ class MediaGenerator:
         output_path = self._get_output_path(resource_type, resource_id)
         self._ensure_parent_dir(output_path)
 
-        # 1. 若已存在，确保旧文件被记录
-        if output_path.exists():
-            self.versions.ensure_current_tracked(
+        # 1. 若已存在且尚无版本记录，在线程中暂存旧文件，与调用记录并发
+        staging = None
+        if output_path.exists() and not self.versions.is_current_tracked(resource_type, resource_id):
+            staging = asyncio.ensure_future(asyncio.to_thread(
+                self.versions.stage_current_for_tracking,
                 resource_type=resource_type,
                 resource_id=resource_id,
                 current_file=output_path,
                 prompt=prompt,
                 aspect_ratio=aspect_ratio,
                 **version_metadata
+            ))
+
+        # 2. 记录 API 调用开始（失败时等暂存完成并清理，避免版本目录残留孤立副本）
+        try:
+            call_id = self.usage_tracker.start_call(
+                project_name=self.project_name,
+                call_type="image",
+                model=self.gemini.IMAGE_MODEL,
+                prompt=prompt,
+                resolution=image_size,
+                aspect_ratio=aspect_ratio,
             )
+        except Exception:
+            if staging:
+                self.versions.discard_staged(await staging)
+            raise
 
-        # 2. 记录 API 调用开始
-        call_id = self.usage_tracker.start_call(
-            project_name=self.project_name,
-            call_type="image",
-            model=self.gemini.IMAGE_MODEL,
-            prompt=prompt,
-            resolution=image_size,
-            aspect_ratio=aspect_ratio,
-        )
+        # 旧文件须在生成覆盖前暂存完毕
+        staged_current = await staging if staging else None
 
         try:
             # 3. 调用 GeminiClient 异步生成新文件
@@ -243,13 +269,16 @@ class MediaGenerator:
                 status="failed",
                 error_message=str(e),
             )
+            self.versions.discard_staged(staged_current)
             raise
 
-        # 5. 记录新版本
-        new_version = self.versions.add_version(
+        # 5. 记录新版本（连同暂存的旧文件）；复制文件放到线程中，避免阻塞其他项目的生成
+        new_version = await asyncio.to_thread(
+            self.versions.record_generation,
             resource_type=resource_type,
             resource_id=resource_id,
             prompt=prompt,
+            staged_current=staged_current,
             source_file=output_path,
             aspect_ratio=aspect_ratio,
             **version_metadata
@@ -264,7 +293,7 @@ class MediaGenerator:
         resource_id: str,
         start_image: Optional[Union[str, Path, Image.Image]] = None,
         aspect_ratio: str = "9:16",
-        duration_seconds: str = "8",
+        duration_seconds: int = 8,
         resolution: str = "1080p",
         negative_prompt: str = "background music, BGM, soundtrack, musical accompaniment",
         **version_metadata
@@ -278,7 +307,7 @@ class MediaGenerator:
             resource_id: 资源 ID (E1S01)
             start_image: 起始帧图片（image-to-video 模式）
             aspect_ratio: 宽高比，默认 9:16（竖屏）
-            duration_seconds: 视频时长，可选 "4", "6", "8"
+            duration_seconds: 视频时长（秒），可选 4, 6, 8
             resolution: 分辨率，默认 "1080p"
             negative_prompt: 负面提示词
             **version_metadata: 额外元数据（如 duration_seconds）
@@ -289,9 +318,10 @@ class MediaGenerator:
         output_path = self._get_output_path(resource_type, resource_id)
         self._ensure_parent_dir(output_path)
 
-        # 1. 若已存在，确保旧文件被记录
-        if output_path.exists():
-            self.versions.ensure_current_tracked(
+        # 1. 若已存在且尚无版本记录，暂存旧文件
+        staged_current = None
+        if output_path.exists() and not self.versions.is_current_tracked(resource_type, resource_id):
+            staged_current = self.versions.stage_current_for_tracking(
                 resource_type=resource_type,
                 resource_id=resource_id,
                 current_file=output_path,
@@ -301,18 +331,13 @@ class MediaGenerator:
             )
 
         # 2. 记录 API 调用开始
-        try:
-            duration_int = int(duration_seconds) if duration_seconds else 8
-        except (ValueError, TypeError):
-            duration_int = 8
-
         call_id = self.usage_tracker.start_call(
             project_name=self.project_name,
             call_type="video",
             model=self.gemini.VIDEO_MODEL,
             prompt=prompt,
             resolution=resolution,
-            duration_seconds=duration_int,
+            duration_seconds=duration_seconds or 8,
             aspect_ratio=aspect_ratio,
             generate_audio=True,
         )
@@ -342,13 +367,15 @@ class MediaGenerator:
                 status="failed",
                 error_message=str(e),
             )
+            self.versions.discard_staged(staged_current)
             raise
 
-        # 5. 记录新版本
-        new_version = self.versions.add_version(
+        # 5. 记录新版本（连同暂存的旧文件）
+        new_version = self.versions.record_generation(
             resource_type=resource_type,
             resource_id=resource_id,
             prompt=prompt,
+            staged_current=staged_current,
             source_file=output_path,
             duration_seconds=duration_seconds,
             **version_metadata
@@ -363,7 +390,7 @@ class MediaGenerator:
         resource_id: str,
         start_image: Optional[Union[str, Path, Image.Image]] = None,
         aspect_ratio: str = "9:16",
-        duration_seconds: str = "8",
+        duration_seconds: int = 8,
         resolution: str = "1080p",
         negative_prompt: str = "background music, BGM, soundtrack, musical accompaniment",
         **version_metadata
@@ -377,7 +404,7 @@ class MediaGenerator:
             resource_id: 资源 ID (E1S01)
             start_image: 起始帧图片（image-to-video 模式）
             aspect_ratio: 宽高比，默认 9:16（竖屏）
-            duration_seconds: 视频时长，可选 "4", "6", "8"
+            duration_seconds: 视频时长（秒），可选 4, 6, 8
             resolution: 分辨率，默认 "1080p"
             negative_prompt: 负面提示词
             **version_metadata: 额外元数据
@@ -388,33 +415,38 @@ class MediaGenerator:
         output_path = self._get_output_path(resource_type, resource_id)
         self._ensure_parent_dir(output_path)
 
-        # 1. 若已存在，确保旧文件被记录
-        if output_path.exists():
-            self.versions.ensure_current_tracked(
+        # 1. 若已存在且尚无版本记录，在线程中暂存旧文件，与调用记录并发
+        staging = None
+        if output_path.exists() and not self.versions.is_current_tracked(resource_type, resource_id):
+            staging = asyncio.ensure_future(asyncio.to_thread(
+                self.versions.stage_current_for_tracking,
                 resource_type=resource_type,
                 resource_id=resource_id,
                 current_file=output_path,
                 prompt=prompt,
                 duration_seconds=duration_seconds,
                 **version_metadata
-            )
+            ))
 
-        # 2. 记录 API 调用开始
+        # 2. 记录 API 调用开始（失败时等暂存完成并清理，避免版本目录残留孤立副本）
         try:
-            duration_int = int(duration_seconds) if duration_seconds else 8
-        except (ValueError, TypeError):
-            duration_int = 8
+            call_id = self.usage_tracker.start_call(
+                project_name=self.project_name,
+                call_type="video",
+                model=self.gemini.VIDEO_MODEL,
+                prompt=prompt,
+                resolution=resolution,
+                duration_seconds=duration_seconds or 8,
+                aspect_ratio=aspect_ratio,
+                generate_audio=True,
+            )
+        except Exception:
+            if staging:
+                self.versions.discard_staged(await staging)
+            raise
 
-        call_id = self.usage_tracker.start_call(
-            project_name=self.project_name,
-            call_type="video",
-            model=self.gemini.VIDEO_MODEL,
-            prompt=prompt,
-            resolution=resolution,
-            duration_seconds=duration_int,
-            aspect_ratio=aspect_ratio,
-            generate_audio=True,
-        )
+        # 旧文件须在生成覆盖前暂存完毕
+        staged_current = await staging if staging else None
 
         try:
             # 3. 调用 GeminiClient 异步生成新视频
@@ -441,13 +473,16 @@ class MediaGenerator:
                 status="failed",
                 error_message=str(e),
             )
+            self.versions.discard_staged(staged_current)
             raise
 
-        # 5. 记录新版本
-        new_version = self.versions.add_version(
+        # 5. 记录新版本（连同暂存的旧文件）；复制文件放到线程中，避免阻塞其他项目的生成
+        new_version = await asyncio.to_thread(
+            self.versions.record_generation,
             resource_type=resource_type,
             resource_id=resource_id,
             prompt=prompt,
+            staged_current=staged_current,
             source_file=output_path,
             duration_seconds=duration_seconds,
             **version_metadata
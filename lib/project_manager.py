@@ -4,17 +4,243 @@
 管理视频项目的目录结构、分镜剧本读写、状态追踪。
 """
 
+import copy
+import itertools
 import json
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # 可选依赖：未安装时回退到标准库 json
+    orjson = None
+
+
+def _decode_json(raw: bytes) -> Any:
+    """解析 UTF-8 JSON 字节（优先 orjson）"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_default(obj: Any) -> Any:
+    """序列化 JSON 原生不支持的类型：datetime/date 转 ISO 字符串、Path 转字符串，两种后端输出一致"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json_file(
+    path: Path, data: Any, *, durable: bool = False, pretty: bool = True
+) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    以非 ASCII 字符原样写入 JSON 文件（优先 orjson），返回 (写入的字节, (mtime_ns, size))
+
+    剧本与 project.json 需要人工/Agent 直接阅读和编辑，默认保留 2 空格缩进；
+    只由程序读写的文件可传 pretty=False 写紧凑格式，体积更小、编码更快。
+    先写同目录临时文件再 os.replace，读方不会看到写了一半的文件；
+    durable=True 时在替换前 fsync。
+    mtime/size 取自替换前的临时文件（os.replace 不改变二者），
+    不会像替换后再 stat 那样拿到其他进程随后写入的版本。
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        payload = orjson.dumps(data, default=_json_default, option=option)
+    elif pretty:
+        payload = json.dumps(data, ensure_ascii=False, indent=2, default=_json_default).encode("utf-8")
+    else:
+        payload = json.dumps(
+            data, ensure_ascii=False, separators=(",", ":"), default=_json_default
+        ).encode("utf-8")
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return payload, (st.st_mtime_ns, st.st_size)
+
+
+def make_exists_checker(base_dir: Path) -> Callable[[Union[str, Path]], bool]:
+    """
+    返回按目录列表判断文件是否存在的函数（路径相对 base_dir，也可为绝对路径）
+
+    每个父目录只 scandir 一次并缓存文件名集合，取代逐个文件 stat。
+    适用于一次性检查大量设计图/参考图的场景，结果仅在本次调用链内有效。
+    """
+    listings: Dict[str, Set[str]] = {}
+    # 逐次调用只做字符串拼接/拆分，不构造 Path 对象
+    base = os.fspath(base_dir)
+
+    def exists(rel_path: Union[str, Path]) -> bool:
+        parent, name = os.path.split(os.path.join(base, rel_path))
+        names = listings.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent) as it:
+                    names = {entry.name for entry in it}
+            except OSError:
+                names = set()
+            listings[parent] = names
+        return name in names
+
+    return exists
+
+
+# 只读的空字典，作为查找缺省值避免每次迭代新建 {}（不得修改）
+_EMPTY_ENTRY: Dict[str, Any] = {}
+
+
+def _iter_sheets(entries: Dict[str, Dict], key: str, names: Iterable[str]) -> Iterator[str]:
+    """按名称依次产出 entries 中非空的设计图路径"""
+    for name in names:
+        sheet = entries.get(name, _EMPTY_ENTRY).get(key)
+        if sheet:
+            yield sheet
+
+
+def _iter_scene_refs(
+    project: Dict, project_dir: Path, scene: Dict, sheet_exists: Callable[[str], bool]
+) -> Iterator[Path]:
+    """产出场景引用的、磁盘上存在的设计图路径（人物在前，线索在后，去重）"""
+    sheets = itertools.chain(
+        _iter_sheets(
+            project.get("characters", {}), "character_sheet", scene.get("characters_in_scene") or ()
+        ),
+        _iter_sheets(project.get("clues", {}), "clue_sheet", scene.get("clues_in_scene") or ()),
+    )
+    seen = set()
+    for sheet in sheets:
+        if sheet in seen:
+            continue
+        seen.add(sheet)
+        if sheet_exists(sheet):
+            yield project_dir / sheet
+
+
+# 从剧本文件名推断集数，如 episode_1.json / Episode 02.json
+_EPISODE_RE = re.compile(r"episode[_\s]*(\d+)", re.IGNORECASE)
+
+# ==================== 场景默认值 ====================
+# normalize_scene 只补缺失字段，直接使用这些常量而不是每次构建完整模板；
+# 列表/字典类型的默认值在写入场景时会复制，避免多个场景共享同一对象。
+
+_SCENE_VISUAL_DEFAULTS = {
+    "description": "",
+    "shot_type": "medium shot",
+    "camera_movement": "static",
+    "lighting": "",
+    "mood": "",
+}
+
+_SCENE_AUDIO_DEFAULTS = {"dialogue": [], "narration": "", "sound_effects": []}
+
+_SCENE_DIALOGUE_DEFAULTS = {"speaker": "", "text": "", "emotion": "neutral"}
+
+_GENERATED_ASSETS_DEFAULTS = {
+    "storyboard_image": None,
+    "video_clip": None,
+    "video_uri": None,
+    "status": "pending",
+}
+
+# 顶层字段（episode 由调用方决定，单独处理）
+_SCENE_TOP_LEVEL_DEFAULTS = {
+    "title": "",
+    "scene_type": "剧情",
+    "segment_break": False,
+    "characters_in_scene": [],
+    "clues_in_scene": [],
+    "action": "",
+    "dialogue": _SCENE_DIALOGUE_DEFAULTS,
+    "transition_to_next": "cut",
+}
+
+
+def _fill_missing(target: Dict, defaults: Dict) -> None:
+    """将 defaults 中 target 缺失的键补入 target（容器类默认值浅复制）"""
+    # 已规范化的数据通常字段齐全，键视图比较在 C 层完成即可提前返回
+    if target.keys() >= defaults.keys():
+        return
+    for key, value in defaults.items():
+        if isinstance(value, (list, dict)):
+            if key not in target:
+                target[key] = value.copy()
+        else:
+            target.setdefault(key, value)
+
+
+def _with_defaults(existing: Optional[Dict], defaults: Dict) -> Dict:
+    """返回补齐 defaults 后的字典（默认值须为不可变对象）；字段已齐全时原样返回，不新建字典"""
+    if existing is None:
+        return dict(defaults)
+    if existing.keys() >= defaults.keys():
+        return existing
+    return {**defaults, **existing}
+
+
 # ==================== 数据模型 ====================
 
 
+class CharacterEntry(TypedDict, total=False):
+    """project.json 中 characters[名称] 的结构（仅用于类型标注，运行时仍为普通 dict）"""
+
+    description: str
+    voice_style: str
+    character_sheet: str
+    reference_image: str
+
+
+class ClueEntry(TypedDict, total=False):
+    """project.json 中 clues[名称] 的结构（仅用于类型标注，运行时仍为普通 dict）"""
+
+    type: str
+    description: str
+    importance: str
+    clue_sheet: str
+
+
+class PendingClue(NamedTuple):
+    """get_pending_clues 返回的待生成线索（只含调用方需要的字段）"""
+
+    name: str
+    type: str
+    description: str
+    clue_sheet: str
+
+
 class ProjectOverview(BaseModel):
     """项目概述数据模型，用于 Gemini Structured Outputs"""
 
@@ -42,6 +268,25 @@ class ProjectManager:
     # 项目元数据文件名
     PROJECT_FILE = "project.json"
 
+    # 项目目录存在性检查的缓存时长（秒）
+    PROJECT_PATH_CACHE_TTL = 30.0
+
+    # 剧本/项目解析缓存各自保留的最大文件数（超出后淘汰最久未使用的条目）
+    PARSED_CACHE_MAX_ENTRIES = 128
+
+    # 项目状态统计：子目录 -> (状态字段, 允许的小写扩展名；None 表示任意文件)
+    _IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+    _VIDEO_EXTENSIONS = frozenset({".mp4", ".webm"})
+    _STATUS_FILE_FILTERS = {
+        "source": ("source_files", None),
+        "scripts": ("scripts", frozenset({".json"})),
+        "characters": ("characters", _IMAGE_EXTENSIONS),
+        "clues": ("clues", _IMAGE_EXTENSIONS),
+        "storyboards": ("storyboards", _IMAGE_EXTENSIONS),
+        "videos": ("videos", _VIDEO_EXTENSIONS),
+        "output": ("outputs", _VIDEO_EXTENSIONS),
+    }
+
     def __init__(self, projects_root: Optional[str] = None):
         """
         初始化项目管理器
@@ -56,13 +301,31 @@ class ProjectManager:
         self.projects_root = Path(projects_root)
         self.projects_root.mkdir(parents=True, exist_ok=True)
 
+        # 剧本缓存：路径 -> ((st_mtime_ns, st_size), 解析结果, 原始字节)，文件变化即失效。
+        # 需要可修改副本时重新解析原始字节，比 deepcopy 解析结果快数倍。
+        self._script_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, bytes]]" = OrderedDict()
+        # 场景 ID 索引：路径 -> (对应的缓存剧本对象, {id: scene})，剧本对象被替换即失效
+        self._scene_index_cache: Dict[str, Tuple[Dict, Dict[str, Dict]]] = {}
+        # project.json 缓存，结构同 _script_cache，共用同一把锁
+        self._project_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, bytes]]" = OrderedDict()
+        # major 线索索引：项目名 -> (对应的缓存项目对象, [(线索名, clue_sheet)])，项目对象被替换即失效
+        self._major_clue_cache: Dict[str, Tuple[Dict, List[Tuple[str, str]]]] = {}
+        self._script_cache_lock = threading.Lock()
+        # 已规范化并保存的剧本：路径 -> 保存后的 (st_mtime_ns, st_size)，文件再变化即失效
+        self._normalized_stamps: Dict[str, Tuple[int, int]] = {}
+        # 已确认存在的项目目录：项目名 -> (确认时的 monotonic 时间, 路径)
+        self._verified_paths: Dict[str, Tuple[float, Path]] = {}
+        # 项目内子路径 Path 对象：(项目名, 子目录或文件名) -> Path，供各路径 getter 复用
+        self._subdir_paths: Dict[Tuple[str, str], Path] = {}
+
     def list_projects(self) -> List[str]:
         """列出所有项目"""
-        return [
-            d.name
-            for d in self.projects_root.iterdir()
-            if d.is_dir() and not d.name.startswith(".")
-        ]
+        with os.scandir(self.projects_root) as it:
+            return [
+                entry.name
+                for entry in it
+                if not entry.name.startswith(".") and entry.is_dir()
+            ]
 
     def create_project(self, name: str) -> Path:
         """
@@ -76,22 +339,59 @@ class ProjectManager:
         """
         project_dir = self.projects_root / name
 
-        if project_dir.exists():
-            raise FileExistsError(f"项目 '{name}' 已存在")
+        # 创建项目目录本身即完成存在性检查，省去单独的 exists()
+        try:
+            project_dir.mkdir(parents=True)
+        except FileExistsError:
+            raise FileExistsError(f"项目 '{name}' 已存在") from None
 
-        # 创建所有子目录
+        # 父目录已确定存在，子目录直接 os.mkdir，无需逐级检查
+        base = str(project_dir)
         for subdir in self.SUBDIRS:
-            (project_dir / subdir).mkdir(parents=True, exist_ok=True)
+            os.mkdir(os.path.join(base, subdir))
 
         return project_dir
 
     def get_project_path(self, name: str) -> Path:
-        """获取项目路径"""
+        """获取项目路径（存在性检查结果缓存 PROJECT_PATH_CACHE_TTL 秒）"""
+        cached = self._verified_paths.get(name)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.PROJECT_PATH_CACHE_TTL:
+            return cached[1]
+
         project_dir = self.projects_root / name
         if not project_dir.exists():
+            self._verified_paths.pop(name, None)
             raise FileNotFoundError(f"项目 '{name}' 不存在")
+        self._verified_paths[name] = (now, project_dir)
         return project_dir
 
+    def _get_subdir_path(self, project_name: str, subdir: str) -> Path:
+        """获取项目内子目录/文件路径（校验项目存在，Path 对象按项目缓存）"""
+        project_dir = self.get_project_path(project_name)
+        key = (project_name, subdir)
+        path = self._subdir_paths.get(key)
+        if path is None:
+            path = self._subdir_paths[key] = project_dir / subdir
+        return path
+
+    def forget_project_path(self, name: str) -> None:
+        """使项目路径及该项目下的剧本/元数据缓存失效（在进程内删除/移动项目目录后调用）"""
+        self._verified_paths.pop(name, None)
+        prefix = str(self.projects_root / name) + os.sep
+        with self._script_cache_lock:
+            for cache in (
+                self._script_cache,
+                self._scene_index_cache,
+                self._project_cache,
+                self._normalized_stamps,
+            ):
+                for key in [k for k in cache if k.startswith(prefix)]:
+                    del cache[key]
+            self._major_clue_cache.pop(name, None)
+        for key in [k for k in self._subdir_paths if k[0] == name]:
+            del self._subdir_paths[key]
+
     def get_project_status(self, name: str) -> Dict[str, Any]:
         """
         获取项目状态
@@ -114,34 +414,19 @@ class ProjectManager:
             "current_stage": "empty",
         }
 
-        # 检查各目录内容
-        for subdir in self.SUBDIRS:
-            subdir_path = project_dir / subdir
-            if subdir_path.exists():
-                files = list(subdir_path.glob("*"))
-                if subdir == "source":
-                    status["source_files"] = [f.name for f in files if f.is_file()]
-                elif subdir == "scripts":
-                    status["scripts"] = [f.name for f in files if f.suffix == ".json"]
-                elif subdir == "characters":
-                    status["characters"] = [
-                        f.name for f in files if f.suffix in [".png", ".jpg", ".jpeg"]
-                    ]
-                elif subdir == "clues":
-                    status["clues"] = [
-                        f.name for f in files if f.suffix in [".png", ".jpg", ".jpeg"]
-                    ]
-                elif subdir == "storyboards":
-                    status["storyboards"] = [
-                        f.name for f in files if f.suffix in [".png", ".jpg", ".jpeg"]
-                    ]
-                elif subdir == "videos":
-                    status["videos"] = [
-                        f.name for f in files if f.suffix in [".mp4", ".webm"]
-                    ]
-                elif subdir == "output":
-                    status["outputs"] = [
-                        f.name for f in files if f.suffix in [".mp4", ".webm"]
+        # 一次 scandir 项目根目录得到已存在的子目录，代替逐个 exists()
+        with os.scandir(project_dir) as entries:
+            existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+
+        # 检查各目录内容（scandir 的 DirEntry 自带文件类型，无需逐个 stat）
+        for subdir, (key, suffixes) in self._STATUS_FILE_FILTERS.items():
+            if subdir in existing_dirs:
+                with os.scandir(project_dir / subdir) as entries:
+                    status[key] = [
+                        entry.name
+                        for entry in entries
+                        if entry.is_file()
+                        and (suffixes is None or os.path.splitext(entry.name)[1].lower() in suffixes)
                     ]
 
         # 确定当前阶段
@@ -179,12 +464,13 @@ class ProjectManager:
         Returns:
             剧本字典
         """
+        now = datetime.now().isoformat()
         script = {
             "novel": {"title": title, "chapter": chapter, "source_file": source_file},
             "scenes": [],
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "total_scenes": 0,
                 "estimated_duration_seconds": 0,
                 "status": "draft",
@@ -207,6 +493,12 @@ class ProjectManager:
         Returns:
             保存的文件路径
         """
+        return self._save_script_stamped(project_name, script, filename)[0]
+
+    def _save_script_stamped(
+        self, project_name: str, script: Dict, filename: Optional[str] = None
+    ) -> Tuple[Path, Tuple[int, int]]:
+        """save_script 的实现，另返回写入时的 (mtime_ns, size)"""
         project_dir = self.get_project_path(project_name)
         scripts_dir = project_dir / "scripts"
 
@@ -214,26 +506,35 @@ class ProjectManager:
             chapter = script["novel"].get("chapter", "chapter_01")
             filename = f"{chapter.replace(' ', '_')}_script.json"
 
-        # 更新元数据
-        script["metadata"]["updated_at"] = datetime.now().isoformat()
-        script["metadata"]["total_scenes"] = len(script.get("scenes", []))
-
-        # 计算总时长
-        total_duration = sum(
-            scene.get("duration_seconds", 6) for scene in script.get("scenes", [])
+        # 更新元数据（统计值每次保存重算一遍：与随后的整文件编码相比开销可忽略，
+        # 且不会因 Agent 直接改写 JSON 而与场景列表脱节）
+        scenes = script.get("scenes", [])
+        metadata = script["metadata"]
+        metadata["updated_at"] = datetime.now().isoformat()
+        metadata["total_scenes"] = len(scenes)
+        metadata["estimated_duration_seconds"] = sum(
+            scene.get("duration_seconds", 6) for scene in scenes
         )
-        script["metadata"]["estimated_duration_seconds"] = total_duration
 
         # 保存文件
         output_path = scripts_dir / filename
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(script, f, ensure_ascii=False, indent=2)
+        stamp = self._write_cached(self._script_cache, output_path, script)
 
-        # 自动同步到 project.json
-        if self.project_exists(project_name) and isinstance(script.get("episode"), int):
-            self.sync_episode_from_script(project_name, filename)
+        # 自动同步到 project.json（剧集条目已一致时只读比较，不重新解析剧本和项目文件）
+        if isinstance(script.get("episode"), int) and self.project_exists(project_name):
+            if not self._episode_in_sync(project_name, filename, script):
+                self.sync_episode_from_script(project_name, filename)
 
-        return output_path
+        return output_path, stamp
+
+    def _episode_in_sync(self, project_name: str, script_filename: str, script: Dict) -> bool:
+        """project.json 中该集的标题和剧本路径是否已与 script 一致（基于共享只读项目数据）"""
+        episode_num = script.get("episode", 1)
+        script_file = f"scripts/{script_filename}"
+        for ep in self._load_project_readonly(project_name).get("episodes", ()):
+            if ep["episode"] == episode_num:
+                return ep.get("title") == script.get("title", "") and ep.get("script_file") == script_file
+        return False
 
     def sync_episode_from_script(self, project_name: str, script_filename: str) -> Dict:
         """
@@ -248,30 +549,17 @@ class ProjectManager:
         Returns:
             更新后的 project 字典
         """
-        script = self.load_script(project_name, script_filename)
+        script = self._load_script_readonly(project_name, script_filename)
         project = self.load_project(project_name)
 
         episode_num = script.get("episode", 1)
         episode_title = script.get("title", "")
         script_file = f"scripts/{script_filename}"
 
-        # 查找或创建 episode 条目
-        episodes = project.setdefault("episodes", [])
-        episode_entry = next(
-            (ep for ep in episodes if ep["episode"] == episode_num), None
-        )
-
-        if episode_entry is None:
-            episode_entry = {"episode": episode_num}
-            episodes.append(episode_entry)
-
         # 同步核心元数据（不包含统计字段，统计字段由 StatusCalculator 读时计算）
-        episode_entry["title"] = episode_title
-        episode_entry["script_file"] = script_file
-
-        # 排序并保存
-        episodes.sort(key=lambda x: x["episode"])
-        self.save_project(project_name, project)
+        episodes = project.setdefault("episodes", [])
+        if self._upsert_episode(episodes, episode_num, episode_title, script_file):
+            self.save_project(project_name, project)
 
         print(f"✅ 已同步剧集信息: Episode {episode_num} - {episode_title}")
         return project
@@ -287,20 +575,141 @@ class ProjectManager:
         Returns:
             剧本字典
         """
-        project_dir = self.get_project_path(project_name)
-        script_path = project_dir / "scripts" / filename
+        return _decode_json(self._load_script_cached(project_name, filename)[1])
+
+    def _script_path(self, project_name: str, filename: str) -> Path:
+        return self._get_subdir_path(project_name, "scripts") / filename
+
+    def _load_script_readonly(self, project_name: str, filename: str) -> Dict:
+        """加载剧本（共享缓存对象，调用方不得修改）"""
+        return self._load_script_cached(project_name, filename)[0]
+
+    def _load_script_cached(self, project_name: str, filename: str) -> Tuple[Dict, bytes]:
+        """返回 (共享的解析结果, 原始 JSON 字节)，按 mtime/size 复用缓存"""
+        script_path = self._script_path(project_name, filename)
+
+        try:
+            st = script_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"剧本文件不存在: {script_path}") from None
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._cache_get(self._script_cache, str(script_path), stamp)
+        if cached is not None:
+            return cached[1], cached[2]
+
+        raw = script_path.read_bytes()
+        script = _decode_json(raw)
+        self._cache_put(self._script_cache, str(script_path), (stamp, script, raw))
+        return script, raw
+
+    def _cache_get(
+        self, cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, bytes]]", key: str, stamp: Tuple[int, int]
+    ) -> Optional[Tuple[Tuple[int, int], Dict, bytes]]:
+        """取出与 stamp 一致的缓存条目并标记为最近使用；不存在或已过期返回 None"""
+        with self._script_cache_lock:
+            cached = cache.get(key)
+            if cached is None or cached[0] != stamp:
+                return None
+            cache.move_to_end(key)
+            return cached
+
+    def _cache_put(
+        self,
+        cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, bytes]]",
+        key: str,
+        entry: Tuple[Tuple[int, int], Dict, bytes],
+    ) -> None:
+        """写入缓存条目，超出 PARSED_CACHE_MAX_ENTRIES 时淘汰最久未使用的文件"""
+        with self._script_cache_lock:
+            cache[key] = entry
+            cache.move_to_end(key)
+            while len(cache) > self.PARSED_CACHE_MAX_ENTRIES:
+                evicted, _ = cache.popitem(last=False)
+                self._scene_index_cache.pop(evicted, None)
+
+    def _write_cached(
+        self,
+        cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, bytes]]",
+        path: Path,
+        data: Dict,
+    ) -> Tuple[int, int]:
+        """
+        写盘并以写入的字节和 mtime/size 更新缓存，下次加载无需重新读取；返回该 (mtime_ns, size)
+
+        缓存的解析结果从写入的字节解码，与调用方的 data 互不共享：
+        调用方保存后继续修改自己的字典不会影响缓存，非 JSON 类型也与磁盘一样已转成字符串。
+        """
+        payload, stamp = write_json_file(path, data)
+        self._cache_put(cache, str(path), (stamp, _decode_json(payload), payload))
+        return stamp
+
+    @staticmethod
+    def _get_script_items(script: Dict) -> Tuple[str, List[Dict], str]:
+        """根据内容模式返回 (content_mode, 场景/片段列表, ID 字段名)"""
+        content_mode = script.get("content_mode", "narration")
+        if content_mode == "narration" and "segments" in script:
+            return content_mode, script["segments"], "segment_id"
+        return content_mode, script.get("scenes", []), "scene_id"
+
+    def get_scene(self, project_name: str, script_filename: str, scene_id: str) -> Dict:
+        """
+        按 ID 获取单个场景/片段（返回副本）
+
+        ID 索引随剧本缓存一起复用，重复查询为 O(1)。
 
-        if not script_path.exists():
-            raise FileNotFoundError(f"剧本文件不存在: {script_path}")
+        Raises:
+            KeyError: 场景不存在
+        """
+        script = self._load_script_readonly(project_name, script_filename)
+        key = str(self._script_path(project_name, script_filename))
 
-        with open(script_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with self._script_cache_lock:
+            cached = self._scene_index_cache.get(key)
+        if cached is not None and cached[0] is script:
+            index = cached[1]
+        else:
+            _, items, id_field = self._get_script_items(script)
+            index = {}
+            for item in items:
+                index.setdefault(str(item.get(id_field)), item)
+            with self._script_cache_lock:
+                self._scene_index_cache[key] = (script, index)
+
+        item = index.get(str(scene_id))
+        if item is None:
+            raise KeyError(f"场景 '{scene_id}' 不存在")
+        return copy.deepcopy(item)
+
+    @contextmanager
+    def edit_script(self, project_name: str, filename: str) -> Iterator[Dict]:
+        """
+        加载剧本供修改，正常退出时只保存一次（发生异常或内容未变化则不保存）
+
+        用法：
+            with pm.edit_script(project_name, "episode_1.json") as script:
+                script["title"] = "..."
+        """
+        original, raw = self._load_script_cached(project_name, filename)
+        script = _decode_json(raw)
+        yield script
+        # 幂等调用（如流水线重试写入相同路径）跳过整次编码与写盘
+        if script != original:
+            self.save_script(project_name, script, filename)
 
     def list_scripts(self, project_name: str) -> List[str]:
         """列出项目中的所有剧本"""
         project_dir = self.get_project_path(project_name)
         scripts_dir = project_dir / "scripts"
-        return [f.name for f in scripts_dir.glob("*.json")]
+        try:
+            with os.scandir(scripts_dir) as it:
+                return [
+                    entry.name
+                    for entry in it
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
 
     # ==================== 人物管理 ====================
 
@@ -327,28 +736,23 @@ class ProjectManager:
         Returns:
             更新后的剧本
         """
-        script = self.load_script(project_name, script_filename)
-
-        script["characters"][name] = {
-            "description": description,
-            "voice_style": voice_style or "",
-            "character_sheet": character_sheet or "",
-        }
-
-        self.save_script(project_name, script, script_filename)
+        with self.edit_script(project_name, script_filename) as script:
+            script["characters"][name] = {
+                "description": description,
+                "voice_style": voice_style or "",
+                "character_sheet": character_sheet or "",
+            }
         return script
 
     def update_character_sheet(
         self, project_name: str, script_filename: str, name: str, sheet_path: str
     ) -> Dict:
         """更新人物设计图路径"""
-        script = self.load_script(project_name, script_filename)
-
-        if name not in script["characters"]:
-            raise KeyError(f"人物 '{name}' 不存在")
+        with self.edit_script(project_name, script_filename) as script:
+            if name not in script["characters"]:
+                raise KeyError(f"人物 '{name}' 不存在")
 
-        script["characters"][name]["character_sheet"] = sheet_path
-        self.save_script(project_name, script, script_filename)
+            script["characters"][name]["character_sheet"] = sheet_path
         return script
 
     # ==================== 数据结构标准化 ====================
@@ -364,12 +768,7 @@ class ProjectManager:
         Returns:
             标准的 generated_assets 字典
         """
-        assets = {
-            "storyboard_image": None,
-            "video_clip": None,
-            "video_uri": None,
-            "status": "pending",
-        }
+        assets = dict(_GENERATED_ASSETS_DEFAULTS)
 
         # 仅 drama 模式包含 storyboard_grid
         if content_mode == "drama":
@@ -401,15 +800,9 @@ class ProjectManager:
             "segment_break": False,
             "characters_in_scene": [],
             "clues_in_scene": [],
-            "visual": {
-                "description": "",
-                "shot_type": "medium shot",
-                "camera_movement": "static",
-                "lighting": "",
-                "mood": "",
-            },
+            "visual": dict(_SCENE_VISUAL_DEFAULTS),
             "action": "",
-            "dialogue": {"speaker": "", "text": "", "emotion": "neutral"},
+            "dialogue": dict(_SCENE_DIALOGUE_DEFAULTS),
             "audio": {"dialogue": [], "narration": "", "sound_effects": []},
             "transition_to_next": "cut",
             "generated_assets": ProjectManager.create_generated_assets(),
@@ -426,53 +819,18 @@ class ProjectManager:
         Returns:
             补全后的场景字典
         """
-        template = self.create_scene_template(
-            scene_id=scene.get("scene_id", "000"),
-            episode=episode,
-            duration_seconds=scene.get("duration_seconds", 8),
+        # 合并 visual / generated_assets 字段（默认值均为不可变对象，可直接合并）
+        scene["visual"] = _with_defaults(scene.get("visual"), _SCENE_VISUAL_DEFAULTS)
+        scene["generated_assets"] = _with_defaults(
+            scene.get("generated_assets"), _GENERATED_ASSETS_DEFAULTS
         )
 
-        # 合并 visual 字段
-        if "visual" not in scene:
-            scene["visual"] = template["visual"]
-        else:
-            for key in template["visual"]:
-                if key not in scene["visual"]:
-                    scene["visual"][key] = template["visual"][key]
-
-        # 合并 audio 字段
-        if "audio" not in scene:
-            scene["audio"] = template["audio"]
-        else:
-            for key in template["audio"]:
-                if key not in scene["audio"]:
-                    scene["audio"][key] = template["audio"][key]
-
-        # 补全 generated_assets 字段
-        if "generated_assets" not in scene:
-            scene["generated_assets"] = self.create_generated_assets()
-        else:
-            assets_template = self.create_generated_assets()
-            for key in assets_template:
-                if key not in scene["generated_assets"]:
-                    scene["generated_assets"][key] = assets_template[key]
+        # 合并 audio 字段（含列表默认值，需逐个复制）
+        _fill_missing(scene.setdefault("audio", {}), _SCENE_AUDIO_DEFAULTS)
 
         # 补全其他顶层字段
-        top_level_defaults = {
-            "episode": episode,
-            "title": "",
-            "scene_type": "剧情",
-            "segment_break": False,
-            "characters_in_scene": [],
-            "clues_in_scene": [],
-            "action": "",
-            "dialogue": template["dialogue"],
-            "transition_to_next": "cut",
-        }
-
-        for key, default_value in top_level_defaults.items():
-            if key not in scene:
-                scene[key] = default_value
+        scene.setdefault("episode", episode)
+        _fill_missing(scene, _SCENE_TOP_LEVEL_DEFAULTS)
 
         # 更新状态
         self.update_scene_status(scene)
@@ -496,17 +854,16 @@ class ProjectManager:
         Returns:
             更新后的状态值
         """
-        assets = scene.get("generated_assets", {})
+        assets = scene.get("generated_assets")
+        if assets is None:
+            assets = scene["generated_assets"] = {}
 
-        has_grid = bool(assets.get("storyboard_grid"))
-        has_image = bool(assets.get("storyboard_image"))
-        has_video = bool(assets.get("video_clip"))
-
-        if has_video:
+        # 按优先级依次判断，命中即停止，不再查询其余字段
+        if assets.get("video_clip"):
             status = "completed"
-        elif has_image:
+        elif assets.get("storyboard_image"):
             status = "storyboard_ready"
-        elif content_mode == "drama" and has_grid:
+        elif content_mode == "drama" and assets.get("storyboard_grid"):
             # 仅 drama 模式下 grid 表示 in_progress
             status = "in_progress"
         else:
@@ -516,27 +873,41 @@ class ProjectManager:
         return status
 
     def normalize_script(
-        self, project_name: str, script_filename: str, save: bool = True
+        self, project_name: str, script_filename: str, save: bool = True, force: bool = False
     ) -> Dict:
         """
         补全现有 script.json 中缺失的字段
 
+        本进程规范化并保存过、且之后文件未再变化（mtime/size 相同）的剧本直接返回，
+        不再逐场景补全。文件被任何途径修改后自动重新规范化。
+
         Args:
             project_name: 项目名称
             script_filename: 剧本文件名
             save: 是否保存修改后的剧本
+            force: 忽略上述记录，总是完整规范化
 
         Returns:
             补全后的剧本字典
         """
-        import re
+        script_path = self._script_path(project_name, script_filename)
+        if not force:
+            try:
+                st = script_path.stat()
+            except FileNotFoundError:
+                st = None
+            if st is not None and self._normalized_stamps.get(str(script_path)) == (
+                st.st_mtime_ns,
+                st.st_size,
+            ):
+                return self.load_script(project_name, script_filename)
 
         script = self.load_script(project_name, script_filename)
 
         # 从文件名或现有数据推断 episode
         episode = script.get("episode", 1)
         if not episode:
-            match = re.search(r"episode[_\s]*(\d+)", script_filename, re.IGNORECASE)
+            match = _EPISODE_RE.search(script_filename)
             if match:
                 episode = int(match.group(1))
             else:
@@ -551,40 +922,25 @@ class ProjectManager:
         }
 
         for key, default_value in script_defaults.items():
-            if key not in script:
-                script[key] = default_value
+            script.setdefault(key, default_value)
 
         # 确保必要的顶层结构存在
-        if "novel" not in script:
-            script["novel"] = {"title": "", "chapter": "", "source_file": ""}
-
-        # 处理旧格式：如果有 characters 对象，同步到 project.json
-        if (
-            "characters" in script
-            and isinstance(script["characters"], dict)
-            and script["characters"]
-        ):
-            print("⚠️  检测到旧格式 characters 对象，自动同步到 project.json...")
-            self.sync_characters_from_script(project_name, script_filename)
-            # sync_characters_from_script 会重新加载和保存 script，所以需要重新加载
-            script = self.load_script(project_name, script_filename)
-
-        # 处理旧格式：如果有 clues 对象，同步到 project.json
-        if "clues" in script and isinstance(script["clues"], dict) and script["clues"]:
-            print("⚠️  检测到旧格式 clues 对象，自动同步到 project.json...")
-            self.sync_clues_from_script(project_name, script_filename)
-            script = self.load_script(project_name, script_filename)
+        script.setdefault("novel", {"title": "", "chapter": "", "source_file": ""})
+
+        # 处理旧格式：剧本内的 characters / clues 对象迁移到 project.json 后从剧本移除。
+        # 直接使用已加载的剧本字典，无需重新读取；剧本随本方法末尾一并保存。
+        self._migrate_legacy_entries(project_name, script)
 
         # 注意：characters_in_episode 和 clues_in_episode 已改为读时计算
         # 不再在 normalize_script 中创建这些字段
 
-        if "scenes" not in script:
-            script["scenes"] = []
+        script.setdefault("scenes", [])
 
         if "metadata" not in script:
+            now = datetime.now().isoformat()
             script["metadata"] = {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "total_scenes": 0,
                 "estimated_duration_seconds": 0,
                 "status": "draft",
@@ -602,11 +958,30 @@ class ProjectManager:
         script["duration_seconds"] = script["metadata"]["estimated_duration_seconds"]
 
         if save:
-            self.save_script(project_name, script, script_filename)
+            _, stamp = self._save_script_stamped(project_name, script, script_filename)
             print(f"✅ 剧本已规范化并保存: {script_filename}")
+            # 记录本次写入的 stamp，而非替换后再 stat（可能拿到其他进程随后写入的未规范化文件）
+            self._normalized_stamps[str(script_path)] = stamp
 
         return script
 
+    def _migrate_legacy_entries(self, project_name: str, script: Dict) -> None:
+        """将旧格式剧本中的 characters / clues 对象并入 project.json 并从 script 中移除（就地修改）"""
+        legacy = [
+            (key, add_batch)
+            for key, add_batch in (
+                ("characters", self.add_characters_batch),
+                ("clues", self.add_clues_batch),
+            )
+            if isinstance(script.get(key), dict) and script[key]
+        ]
+        if not legacy or not self.project_exists(project_name):
+            return
+
+        for key, add_batch in legacy:
+            print(f"⚠️  检测到旧格式 {key} 对象，自动同步到 project.json...")
+            add_batch(project_name, script.pop(key))
+
     # ==================== 场景管理 ====================
 
     def add_scene(self, project_name: str, script_filename: str, scene: Dict) -> Dict:
@@ -621,23 +996,37 @@ class ProjectManager:
         Returns:
             更新后的剧本
         """
-        script = self.load_script(project_name, script_filename)
+        return self.add_scenes_bulk(project_name, script_filename, [scene])
 
-        # 自动生成场景 ID
-        existing_ids = [s["scene_id"] for s in script["scenes"]]
-        next_id = f"{len(existing_ids) + 1:03d}"
-        scene["scene_id"] = next_id
-
-        # 确保有 generated_assets 字段
-        if "generated_assets" not in scene:
-            scene["generated_assets"] = {
-                "storyboard_image": None,
-                "video_clip": None,
-                "status": "pending",
-            }
+    def add_scenes_bulk(self, project_name: str, script_filename: str, scenes: Iterable[Dict]) -> Dict:
+        """
+        向剧本依次追加多个场景，只读写一次剧本文件
+
+        场景 ID 按追加顺序自动编号，规则同 add_scene。
 
-        script["scenes"].append(scene)
-        self.save_script(project_name, script, script_filename)
+        Args:
+            project_name: 项目名称
+            script_filename: 剧本文件名
+            scenes: 场景字典列表
+
+        Returns:
+            更新后的剧本
+        """
+        with self.edit_script(project_name, script_filename) as script:
+            script_scenes = script["scenes"]
+            for scene in scenes:
+                # 自动生成场景 ID
+                scene["scene_id"] = f"{len(script_scenes) + 1:03d}"
+
+                # 确保有 generated_assets 字段
+                if "generated_assets" not in scene:
+                    scene["generated_assets"] = {
+                        "storyboard_image": None,
+                        "video_clip": None,
+                        "status": "pending",
+                    }
+
+                script_scenes.append(scene)
         return script
 
     def update_scene_asset(
@@ -661,34 +1050,73 @@ class ProjectManager:
         Returns:
             更新后的剧本
         """
-        script = self.load_script(project_name, script_filename)
+        return self.update_scene_assets_bulk(
+            project_name, script_filename, [(scene_id, asset_type, asset_path)]
+        )
 
-        # 根据内容模式选择正确的数据结构
-        content_mode = script.get("content_mode", "narration")
-        if content_mode == "narration" and "segments" in script:
-            items = script["segments"]
-            id_field = "segment_id"
-        else:
-            items = script.get("scenes", [])
-            id_field = "scene_id"
+    def update_scene_assets_bulk(
+        self,
+        project_name: str,
+        script_filename: str,
+        updates: Sequence[Tuple[str, str, str]],
+    ) -> Dict:
+        """
+        批量更新多个场景的生成资源路径（只加载、保存剧本一次）
 
-        for item in items:
-            if item[id_field] == scene_id:
+        Args:
+            project_name: 项目名称
+            script_filename: 剧本文件名
+            updates: (scene_id, asset_type, asset_path) 列表
+
+        Returns:
+            更新后的剧本
+
+        Raises:
+            KeyError: 任一场景不存在时抛出，此时剧本不会被保存
+        """
+        with self.edit_script(project_name, script_filename) as script:
+            # 根据内容模式选择正确的数据结构
+            content_mode, items, id_field = self._get_script_items(script)
+
+            items_by_id: Dict[str, Dict] = {}
+            for item in items:
+                items_by_id.setdefault(item[id_field], item)
+
+            for scene_id, asset_type, asset_path in updates:
+                item = items_by_id.get(scene_id)
+                if item is None:
+                    raise KeyError(f"场景 '{scene_id}' 不存在")
                 item["generated_assets"][asset_type] = asset_path
 
                 # 使用 update_scene_status 更新状态
                 self.update_scene_status(item, content_mode)
+        return script
 
-                self.save_script(project_name, script, script_filename)
-                return script
+    def iter_pending_scenes(
+        self, project_name: str, script_filename: str, asset_type: str
+    ) -> Iterator[Dict]:
+        """
+        逐个产出缺少指定资源的场景/片段（副本），只取下一个时无需复制整个列表
 
-        raise KeyError(f"场景 '{scene_id}' 不存在")
+        Args:
+            project_name: 项目名称
+            script_filename: 剧本文件名
+            asset_type: 资源类型
+
+        Yields:
+            待处理场景/片段的副本
+        """
+        script = self._load_script_readonly(project_name, script_filename)
+        _, items, _ = self._get_script_items(script)
+        for item in items:
+            if not item["generated_assets"].get(asset_type):
+                yield copy.deepcopy(item)
 
     def get_pending_scenes(
         self, project_name: str, script_filename: str, asset_type: str
     ) -> List[Dict]:
         """
-        获取待处理的场景/片段列表
+        获取待处理的场景/片段列表（iter_pending_scenes 的列表形式）
 
         Args:
             project_name: 项目名称
@@ -698,47 +1126,63 @@ class ProjectManager:
         Returns:
             待处理场景/片段列表
         """
-        script = self.load_script(project_name, script_filename)
-
-        # 根据内容模式选择正确的数据结构
-        content_mode = script.get("content_mode", "narration")
-        if content_mode == "narration" and "segments" in script:
-            items = script["segments"]
-        else:
-            items = script.get("scenes", [])
-
-        return [item for item in items if not item["generated_assets"].get(asset_type)]
+        return list(self.iter_pending_scenes(project_name, script_filename, asset_type))
 
     # ==================== 文件路径工具 ====================
 
     def get_source_path(self, project_name: str, filename: str) -> Path:
         """获取源文件路径"""
-        return self.get_project_path(project_name) / "source" / filename
+        return self._get_subdir_path(project_name, "source") / filename
 
     def get_character_path(self, project_name: str, filename: str) -> Path:
         """获取人物设计图路径"""
-        return self.get_project_path(project_name) / "characters" / filename
+        return self._get_subdir_path(project_name, "characters") / filename
 
     def get_storyboard_path(self, project_name: str, filename: str) -> Path:
         """获取分镜图片路径"""
-        return self.get_project_path(project_name) / "storyboards" / filename
+        return self._get_subdir_path(project_name, "storyboards") / filename
 
     def get_video_path(self, project_name: str, filename: str) -> Path:
         """获取视频路径"""
-        return self.get_project_path(project_name) / "videos" / filename
+        return self._get_subdir_path(project_name, "videos") / filename
 
     def get_output_path(self, project_name: str, filename: str) -> Path:
         """获取输出路径"""
-        return self.get_project_path(project_name) / "output" / filename
+        return self._get_subdir_path(project_name, "output") / filename
+
+    def iter_scenes_needing_individual(
+        self, project_name: str, script_filename: str
+    ) -> Iterator[Dict]:
+        """
+        逐个产出需要生成分镜图的场景/片段（副本）
+
+        - narration 模式：产出所有没有 storyboard_image 的片段
+        - drama 模式：产出有 storyboard_grid 但无 storyboard_image 的场景
+
+        Args:
+            project_name: 项目名称
+            script_filename: 剧本文件名
+
+        Yields:
+            需要生成分镜图的场景/片段副本
+        """
+        script = self._load_script_readonly(project_name, script_filename)
+        _, items, id_field = self._get_script_items(script)
+        # narration 模式直接检查是否缺少 storyboard_image；drama 模式需要先有 grid，再生成 image
+        needs_grid = id_field != "segment_id"
+        for item in items:
+            assets = item.get("generated_assets", _EMPTY_ENTRY)
+            if assets.get("storyboard_image"):
+                continue
+            if needs_grid and not assets.get("storyboard_grid"):
+                continue
+            yield copy.deepcopy(item)
 
     def get_scenes_needing_individual(
         self, project_name: str, script_filename: str
     ) -> List[Dict]:
         """
-        获取需要生成分镜图的场景/片段列表
-
-        - narration 模式：返回所有没有 storyboard_image 的片段
-        - drama 模式：返回有 storyboard_grid 但无 storyboard_image 的场景
+        获取需要生成分镜图的场景/片段列表（iter_scenes_needing_individual 的列表形式）
 
         Args:
             project_name: 项目名称
@@ -747,33 +1191,13 @@ class ProjectManager:
         Returns:
             需要生成分镜图的场景/片段列表
         """
-        script = self.load_script(project_name, script_filename)
-
-        # 根据内容模式选择正确的数据结构
-        content_mode = script.get("content_mode", "narration")
-        if content_mode == "narration" and "segments" in script:
-            items = script["segments"]
-            # narration 模式：直接检查是否缺少 storyboard_image
-            return [
-                item
-                for item in items
-                if not item.get("generated_assets", {}).get("storyboard_image")
-            ]
-        else:
-            items = script.get("scenes", [])
-            # drama 模式：需要先有 grid，再生成 image
-            return [
-                item
-                for item in items
-                if item.get("generated_assets", {}).get("storyboard_grid")
-                and not item.get("generated_assets", {}).get("storyboard_image")
-            ]
+        return list(self.iter_scenes_needing_individual(project_name, script_filename))
 
     # ==================== 项目级元数据管理 ====================
 
     def _get_project_file_path(self, project_name: str) -> Path:
         """获取项目元数据文件路径"""
-        return self.get_project_path(project_name) / self.PROJECT_FILE
+        return self._get_subdir_path(project_name, self.PROJECT_FILE)
 
     def project_exists(self, project_name: str) -> bool:
         """检查项目元数据文件是否存在"""
@@ -792,13 +1216,37 @@ class ProjectManager:
         Returns:
             项目元数据字典
         """
+        return _decode_json(self._load_project_cached(project_name)[1])
+
+    def _load_project_readonly(self, project_name: str) -> Dict:
+        """加载项目元数据（共享缓存对象，调用方不得修改）"""
+        return self._load_project_cached(project_name)[0]
+
+    def _resolve_project(self, project_name: str) -> Tuple[Dict, Path]:
+        """一次路径检查同时返回 (共享的项目元数据, 项目目录)，调用方不得修改项目元数据"""
         project_file = self._get_project_file_path(project_name)
+        return self._load_project_file_cached(project_file)[0], project_file.parent
+
+    def _load_project_cached(self, project_name: str) -> Tuple[Dict, bytes]:
+        """返回 (共享的解析结果, 原始 JSON 字节)，按 mtime/size 复用缓存"""
+        return self._load_project_file_cached(self._get_project_file_path(project_name))
+
+    def _load_project_file_cached(self, project_file: Path) -> Tuple[Dict, bytes]:
+        """按文件路径读取 project.json，mtime/size 未变时复用缓存"""
+        try:
+            st = project_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"项目元数据文件不存在: {project_file}") from None
 
-        if not project_file.exists():
-            raise FileNotFoundError(f"项目元数据文件不存在: {project_file}")
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._cache_get(self._project_cache, str(project_file), stamp)
+        if cached is not None:
+            return cached[1], cached[2]
 
-        with open(project_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        raw = project_file.read_bytes()
+        project = _decode_json(raw)
+        self._cache_put(self._project_cache, str(project_file), (stamp, project, raw))
+        return project, raw
 
     def save_project(self, project_name: str, project: Dict) -> Path:
         """
@@ -814,17 +1262,17 @@ class ProjectManager:
         project_file = self._get_project_file_path(project_name)
 
         # 确保 metadata 字段存在
+        now = datetime.now().isoformat()
         if "metadata" not in project:
             project["metadata"] = {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             }
         else:
             # 更新时间戳
-            project["metadata"]["updated_at"] = datetime.now().isoformat()
+            project["metadata"]["updated_at"] = now
 
-        with open(project_file, "w", encoding="utf-8") as f:
-            json.dump(project, f, ensure_ascii=False, indent=2)
+        self._write_cached(self._project_cache, project_file, project)
 
         return project_file
 
@@ -847,6 +1295,7 @@ class ProjectManager:
         Returns:
             项目元数据字典
         """
+        now = datetime.now().isoformat()
         project = {
             "title": title,
             "content_mode": content_mode,
@@ -855,8 +1304,8 @@ class ProjectManager:
             "characters": {},
             "clues": {},
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
             },
         }
 
@@ -880,24 +1329,32 @@ class ProjectManager:
         """
         project = self.load_project(project_name)
 
-        # 检查是否已存在
-        for ep in project["episodes"]:
+        # 不包含统计字段，由 StatusCalculator 读时计算
+        episodes = project.setdefault("episodes", [])
+        if self._upsert_episode(episodes, episode, title, script_file):
+            self.save_project(project_name, project)
+        return project
+
+    @staticmethod
+    def _upsert_episode(episodes: List[Dict], episode: int, title: str, script_file: str) -> bool:
+        """
+        更新或插入剧集条目并保持按集数排序，返回列表是否有变化
+
+        每次调用只处理一集，单次线性查找即可；已存在且内容相同时不做修改，调用方据此跳过写盘。
+        """
+        for ep in episodes:
             if ep["episode"] == episode:
+                if ep.get("title") == title and ep.get("script_file") == script_file:
+                    return False
                 ep["title"] = title
                 ep["script_file"] = script_file
-                self.save_project(project_name, project)
-                return project
+                return True
 
-        # 添加新剧集（不包含统计字段，由 StatusCalculator 读时计算）
-        project["episodes"].append(
-            {"episode": episode, "title": title, "script_file": script_file}
-        )
-
-        # 按集数排序
-        project["episodes"].sort(key=lambda x: x["episode"])
-
-        self.save_project(project_name, project)
-        return project
+        episodes.append({"episode": episode, "title": title, "script_file": script_file})
+        # 通常按集数顺序追加，只有插入到中间时才需要重新排序
+        if len(episodes) > 1 and episodes[-2]["episode"] > episode:
+            episodes.sort(key=lambda x: x["episode"])
+        return True
 
     def sync_project_status(self, project_name: str) -> Dict:
         """
@@ -949,12 +1406,15 @@ class ProjectManager:
         """
         project = self.load_project(project_name)
 
-        project["characters"][name] = {
+        character = {
             "description": description,
             "voice_style": voice_style or "",
             "character_sheet": character_sheet or "",
         }
+        if project["characters"].get(name) == character:
+            return project
 
+        project["characters"][name] = character
         self.save_project(project_name, project)
         return project
 
@@ -967,6 +1427,9 @@ class ProjectManager:
         if name not in project["characters"]:
             raise KeyError(f"人物 '{name}' 不存在")
 
+        if project["characters"][name].get("character_sheet") == sheet_path:
+            return project
+
         project["characters"][name]["character_sheet"] = sheet_path
         self.save_project(project_name, project)
         return project
@@ -990,18 +1453,21 @@ class ProjectManager:
         if "characters" not in project or char_name not in project["characters"]:
             raise KeyError(f"人物 '{char_name}' 不存在")
 
+        if project["characters"][char_name].get("reference_image") == ref_path:
+            return project
+
         project["characters"][char_name]["reference_image"] = ref_path
         self.save_project(project_name, project)
         return project
 
-    def get_project_character(self, project_name: str, name: str) -> Dict:
-        """获取项目级人物定义"""
-        project = self.load_project(project_name)
+    def get_project_character(self, project_name: str, name: str) -> CharacterEntry:
+        """获取项目级人物定义（返回副本）"""
+        project = self._load_project_readonly(project_name)
 
         if name not in project["characters"]:
             raise KeyError(f"人物 '{name}' 不存在")
 
-        return project["characters"][name]
+        return copy.deepcopy(project["characters"][name])
 
     # ==================== 线索管理 ====================
 
@@ -1065,11 +1531,14 @@ class ProjectManager:
         if name not in project["clues"]:
             raise KeyError(f"线索 '{name}' 不存在")
 
+        if project["clues"][name].get("clue_sheet") == sheet_path:
+            return project
+
         project["clues"][name]["clue_sheet"] = sheet_path
         self.save_project(project_name, project)
         return project
 
-    def get_clue(self, project_name: str, name: str) -> Dict:
+    def get_clue(self, project_name: str, name: str) -> ClueEntry:
         """
         获取线索定义
 
@@ -1078,40 +1547,75 @@ class ProjectManager:
             name: 线索名称
 
         Returns:
-            线索定义字典
+            线索定义字典（副本）
         """
-        project = self.load_project(project_name)
+        project = self._load_project_readonly(project_name)
 
         if name not in project["clues"]:
             raise KeyError(f"线索 '{name}' 不存在")
 
-        return project["clues"][name]
+        return copy.deepcopy(project["clues"][name])
+
+    def iter_pending_clues(self, project_name: str) -> Iterator[PendingClue]:
+        """
+        逐个产出待生成设计图的线索
+
+        设计图是否存在按读时检查（每个目录一次 scandir），不在 project.json 中
+        持久化"已生成"标记：设计图可能被上传、版本还原或手动删除，存储的标记会与磁盘脱节。
+        遍历基于调用时的项目快照，期间 update_clue_sheet 写入的新路径不影响本次遍历。
+
+        Args:
+            project_name: 项目名称
+
+        Yields:
+            待处理线索（importance='major' 且 clue_sheet 为空或文件不存在），
+            需要 dict 时可用 ``clue._asdict()``
+        """
+        project, project_dir = self._resolve_project(project_name)
+        sheet_exists = make_exists_checker(project_dir)
+        clues = project["clues"]
+
+        # 未填写设计图路径的线索无需检查磁盘，直接判为待处理
+        for name, sheet in self._get_major_clue_sheets(project_name, project):
+            if not sheet or not sheet_exists(sheet):
+                clue = clues[name]
+                yield PendingClue(name, clue.get("type", "prop"), clue.get("description", ""), sheet)
 
-    def get_pending_clues(self, project_name: str) -> List[Dict]:
+    def get_pending_clues(self, project_name: str) -> List[PendingClue]:
         """
-        获取待生成设计图的线索列表
+        获取待生成设计图的线索列表（iter_pending_clues 的列表形式）
 
         Args:
             project_name: 项目名称
 
         Returns:
-            待处理线索列表（importance='major' 且无 clue_sheet）
+            待处理线索列表
         """
-        project = self.load_project(project_name)
-        project_dir = self.get_project_path(project_name)
+        return list(self.iter_pending_clues(project_name))
+
+    def _get_major_clue_sheets(self, project_name: str, project: Dict) -> List[Tuple[str, str]]:
+        """
+        返回 importance='major' 线索的 (名称, clue_sheet) 列表
 
-        pending = []
-        for name, clue in project["clues"].items():
-            if clue.get("importance") == "major":
-                sheet = clue.get("clue_sheet")
-                if not sheet or not (project_dir / sheet).exists():
-                    pending.append({"name": name, **clue})
+        按缓存的项目对象惰性构建一次（不写入 project.json），项目内容变化后自动重建。
+        """
+        with self._script_cache_lock:
+            cached = self._major_clue_cache.get(project_name)
+        if cached is not None and cached[0] is project:
+            return cached[1]
 
-        return pending
+        majors = [
+            (name, clue.get("clue_sheet") or "")
+            for name, clue in project.get("clues", {}).items()
+            if clue.get("importance") == "major"
+        ]
+        with self._script_cache_lock:
+            self._major_clue_cache[project_name] = (project, majors)
+        return majors
 
     def get_clue_path(self, project_name: str, filename: str) -> Path:
         """获取线索设计图路径"""
-        return self.get_project_path(project_name) / "clues" / filename
+        return self._get_subdir_path(project_name, "clues") / filename
 
     # ==================== 角色/线索直接写入工具 ====================
 
@@ -1267,40 +1771,66 @@ class ProjectManager:
 
     # ==================== 参考图收集工具 ====================
 
-    def collect_reference_images(self, project_name: str, scene: Dict) -> List[Path]:
+    def iter_reference_images(
+        self,
+        project_name: str,
+        scene: Dict,
+        sheet_exists: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[Path]:
         """
-        收集场景所需的所有参考图
+        按顺序逐个产出场景所需的参考图（人物在前，线索在后，重复的设计图只产出一次）
 
         Args:
             project_name: 项目名称
             scene: 场景字典
+            sheet_exists: 可选的存在性检查函数（make_exists_checker 的返回值）；
+                逐场景调用时传入同一个，目录列表在各场景间复用
+
+        Yields:
+            存在的参考图路径
+        """
+        if not scene.get("characters_in_scene") and not scene.get("clues_in_scene"):
+            # 无人物/线索的场景（如纯旁白）无需加载项目元数据
+            return
+
+        project, project_dir = self._resolve_project(project_name)
+        if sheet_exists is None:
+            sheet_exists = make_exists_checker(project_dir)
+        yield from _iter_scene_refs(project, project_dir, scene, sheet_exists)
+
+    def collect_reference_images(
+        self,
+        project_name: str,
+        scene: Dict,
+        sheet_exists: Optional[Callable[[str], bool]] = None,
+    ) -> List[Path]:
+        """
+        收集场景所需的所有参考图（iter_reference_images 的列表形式）
 
         Returns:
             参考图路径列表
         """
-        project = self.load_project(project_name)
-        project_dir = self.get_project_path(project_name)
-        refs = []
-
-        # 人物参考图
-        for char in scene.get("characters_in_scene", []):
-            char_data = project["characters"].get(char, {})
-            sheet = char_data.get("character_sheet")
-            if sheet:
-                sheet_path = project_dir / sheet
-                if sheet_path.exists():
-                    refs.append(sheet_path)
-
-        # 线索参考图
-        for clue in scene.get("clues_in_scene", []):
-            clue_data = project["clues"].get(clue, {})
-            sheet = clue_data.get("clue_sheet")
-            if sheet:
-                sheet_path = project_dir / sheet
-                if sheet_path.exists():
-                    refs.append(sheet_path)
-
-        return refs
+        return list(self.iter_reference_images(project_name, scene, sheet_exists))
+
+    def collect_reference_images_for_scenes(
+        self, project_name: str, scenes: Sequence[Dict]
+    ) -> List[List[Path]]:
+        """
+        批量收集多个场景的参考图：项目元数据只解析一次，各目录只列一次
+
+        Args:
+            project_name: 项目名称
+            scenes: 场景字典列表
+
+        Returns:
+            与 scenes 一一对应的参考图路径列表
+        """
+        project, project_dir = self._resolve_project(project_name)
+        sheet_exists = make_exists_checker(project_dir)
+        return [
+            list(_iter_scene_refs(project, project_dir, scene, sheet_exists))
+            for scene in scenes
+        ]
 
     # ==================== 项目概述生成 ====================
 
@@ -1318,27 +1848,34 @@ class ProjectManager:
         project_dir = self.get_project_path(project_name)
         source_dir = project_dir / "source"
 
-        if not source_dir.exists():
+        try:
+            with os.scandir(source_dir) as entries:
+                names = [
+                    entry.name
+                    for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in (".txt", ".md")
+                ]
+        except FileNotFoundError:
             return ""
 
         contents = []
         total_chars = 0
 
         # 按文件名排序，确保顺序一致
-        for file_path in sorted(source_dir.glob("*")):
-            if file_path.is_file() and file_path.suffix.lower() in [".txt", ".md"]:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        remaining = max_chars - total_chars
-                        if remaining <= 0:
-                            break
-                        if len(content) > remaining:
-                            content = content[:remaining]
-                        contents.append(f"--- {file_path.name} ---\n{content}")
-                        total_chars += len(content)
-                except Exception as e:
-                    print(f"⚠️  读取文件失败 {file_path.name}: {e}")
+        for file_name in sorted(names):
+            file_path = source_dir / file_name
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                    remaining = max_chars - total_chars
+                    if remaining <= 0:
+                        break
+                    if len(content) > remaining:
+                        content = content[:remaining]
+                    contents.append(f"--- {file_path.name} ---\n{content}")
+                    total_chars += len(content)
+            except Exception as e:
+                print(f"⚠️  读取文件失败 {file_path.name}: {e}")
 
         return "\n\n".join(contents)
 
@@ -12,6 +12,7 @@ from typing import Optional, Union
 from pydantic import ValidationError
 
 from lib.gemini_client import GeminiClient
+from lib.project_manager import write_json_file
 from lib.prompt_builders_script import (
     build_drama_prompt,
     build_narration_prompt,
@@ -108,8 +109,7 @@ class ScriptGenerator:
             output_path = self.project_path / "scripts" / f"episode_{episode}.json"
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(script_data, f, ensure_ascii=False, indent=2)
+        write_json_file(output_path, script_data)
 
         print(f"✓ 剧本已保存至 {output_path}")
         return output_path
@@ -197,23 +197,23 @@ class ScriptGenerator:
             text = text[:-3]
         text = text.strip()
 
-        # 解析 JSON
+        # 解析 + Pydantic 验证一次完成（model_validate_json 直接从 JSON 文本构建模型，
+        # 不再先 json.loads 成 dict 再逐字段校验）
+        model = NarrationEpisodeScript if self.content_mode == "narration" else DramaEpisodeScript
+        try:
+            return model.model_validate_json(text).model_dump()
+        except ValidationError as e:
+            validation_error = e
+
+        # 仅在校验失败时再解析出原始数据（JSON 本身不合法则报错）
         try:
             data = json.loads(text)
         except json.JSONDecodeError as e:
             raise ValueError(f"JSON 解析失败: {e}")
 
-        # Pydantic 验证
-        try:
-            if self.content_mode == "narration":
-                validated = NarrationEpisodeScript.model_validate(data)
-            else:
-                validated = DramaEpisodeScript.model_validate(data)
-            return validated.model_dump()
-        except ValidationError as e:
-            print(f"⚠️ 数据验证警告: {e}")
-            # 返回原始数据，允许部分不符合 schema
-            return data
+        print(f"⚠️ 数据验证警告: {validation_error}")
+        # 返回原始数据，允许部分不符合 schema
+        return data
 
     def _add_metadata(self, script_data: dict, episode: int) -> dict:
         """
@@ -5,8 +5,33 @@
 配合 ProjectManager 使用，在 API 响应时注入计算字段。
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from lib.project_manager import _EMPTY_ENTRY, make_exists_checker
+
+# 并行读取各集剧本的最大线程数（读取以文件 I/O 为主，期间释放 GIL）
+EPISODE_SCAN_MAX_WORKERS = 8
+
+# 进程内共享的剧本读取线程池：多个项目同时计算统计时总线程数仍以 EPISODE_SCAN_MAX_WORKERS 为上限
+_episode_scan_executor: Optional[ThreadPoolExecutor] = None
+_episode_scan_executor_lock = threading.Lock()
+
+
+def _get_episode_scan_executor() -> ThreadPoolExecutor:
+    global _episode_scan_executor
+    if _episode_scan_executor is not None:
+        return _episode_scan_executor
+
+    with _episode_scan_executor_lock:
+        if _episode_scan_executor is None:
+            _episode_scan_executor = ThreadPoolExecutor(
+                max_workers=EPISODE_SCAN_MAX_WORKERS,
+                thread_name_prefix="episode-scan",
+            )
+        return _episode_scan_executor
 
 
 class StatusCalculator:
@@ -51,15 +76,14 @@ class StatusCalculator:
         content_mode, items = self._select_content_mode_and_items(script)
         default_duration = 4 if content_mode == 'narration' else 8
 
-        # 统计资源完成情况
-        storyboard_done = sum(
-            1 for i in items
-            if i.get('generated_assets', {}).get('storyboard_image')
-        )
-        video_done = sum(
-            1 for i in items
-            if i.get('generated_assets', {}).get('video_clip')
-        )
+        # 统计资源完成情况（单次遍历，每个条目只取一次 generated_assets）
+        storyboard_done = video_done = 0
+        for i in items:
+            assets = i.get('generated_assets') or _EMPTY_ENTRY
+            if assets.get('storyboard_image'):
+                storyboard_done += 1
+            if assets.get('video_clip'):
+                video_done += 1
         total = len(items)
 
         # 计算状态
@@ -78,25 +102,62 @@ class StatusCalculator:
             'videos_completed': video_done
         }
 
-    def calculate_project_progress(self, project_name: str) -> Dict:
+    def _load_episode_stats(self, project_name: str, ep: Dict) -> Optional[Dict]:
+        """读取单集剧本并计算统计；未关联剧本返回 None，剧本文件不存在时 status 为 missing"""
+        script_file = ep.get('script_file', '').replace('scripts/', '')
+        if not script_file:
+            return None
+        try:
+            script = self.pm.load_script(project_name, script_file)
+        except FileNotFoundError:
+            return {
+                'scenes_count': 0,
+                'status': 'missing',
+                'duration_seconds': 0,
+                'storyboards_completed': 0,
+                'videos_completed': 0
+            }
+        return self.calculate_episode_stats(project_name, script)
+
+    def collect_episode_stats(self, project_name: str, episodes: List[Dict]) -> List[Optional[Dict]]:
+        """
+        并行读取各集剧本并计算统计信息
+
+        Args:
+            project_name: 项目名称
+            episodes: project.json 中的 episodes 列表
+
+        Returns:
+            与 episodes 一一对应的统计信息列表（未关联剧本的条目为 None）
+        """
+        if len(episodes) <= 1:
+            return [self._load_episode_stats(project_name, ep) for ep in episodes]
+        executor = _get_episode_scan_executor()
+        return list(executor.map(lambda ep: self._load_episode_stats(project_name, ep), episodes))
+
+    def calculate_project_progress(
+        self, project_name: str, episode_stats: Optional[List[Optional[Dict]]] = None
+    ) -> Dict:
         """
         计算项目整体进度（实时）
 
         Args:
             project_name: 项目名称
+            episode_stats: 已计算好的各集统计（collect_episode_stats 的结果），为空时重新读取
 
         Returns:
             进度统计字典
         """
         project = self.pm.load_project(project_name)
         project_dir = self.pm.get_project_path(project_name)
+        sheet_exists = make_exists_checker(project_dir)
 
         # 人物统计
         chars = project.get('characters', {})
         chars_total = len(chars)
         chars_done = sum(
             1 for c in chars.values()
-            if c.get('character_sheet') and (project_dir / c['character_sheet']).exists()
+            if c.get('character_sheet') and sheet_exists(c['character_sheet'])
         )
 
         # 线索统计
@@ -104,24 +165,21 @@ class StatusCalculator:
         clues_total = len([c for c in clues.values() if c.get('importance') == 'major'])
         clues_done = sum(
             1 for c in clues.values()
-            if c.get('clue_sheet') and (project_dir / c['clue_sheet']).exists()
+            if c.get('clue_sheet') and sheet_exists(c['clue_sheet'])
         )
 
         # 分镜/视频统计（遍历所有剧本）
         sb_total, sb_done, vid_total, vid_done = 0, 0, 0, 0
 
-        for ep in project.get('episodes', []):
-            script_file = ep.get('script_file', '').replace('scripts/', '')
-            if script_file:
-                try:
-                    script = self.pm.load_script(project_name, script_file)
-                    stats = self.calculate_episode_stats(project_name, script)
-                    sb_total += stats['scenes_count']
-                    vid_total += stats['scenes_count']
-                    sb_done += stats['storyboards_completed']
-                    vid_done += stats['videos_completed']
-                except FileNotFoundError:
-                    pass
+        if episode_stats is None:
+            episode_stats = self.collect_episode_stats(project_name, project.get('episodes', []))
+
+        for stats in episode_stats:
+            if stats:
+                sb_total += stats['scenes_count']
+                vid_total += stats['scenes_count']
+                sb_done += stats['storyboards_completed']
+                vid_done += stats['videos_completed']
 
         return {
             'characters': {'total': chars_total, 'completed': chars_done},
@@ -170,8 +228,12 @@ class StatusCalculator:
         Returns:
             注入计算字段后的项目数据
         """
+        # 每集剧本只读取一次，同时用于整体进度和各集字段
+        episodes = project.get('episodes', [])
+        episode_stats = self.collect_episode_stats(project_name, episodes)
+
         # 计算整体进度
-        progress = self.calculate_project_progress(project_name)
+        progress = self.calculate_project_progress(project_name, episode_stats)
         current_phase = self.calculate_current_phase(progress)
 
         # 注入 status
@@ -181,19 +243,11 @@ class StatusCalculator:
         }
 
         # 为每个 episode 注入计算字段
-        for ep in project.get('episodes', []):
-            script_file = ep.get('script_file', '').replace('scripts/', '')
-            if script_file:
-                try:
-                    script = self.pm.load_script(project_name, script_file)
-                    stats = self.calculate_episode_stats(project_name, script)
-                    ep['scenes_count'] = stats['scenes_count']
-                    ep['status'] = stats['status']
-                    ep['duration_seconds'] = stats['duration_seconds']
-                except FileNotFoundError:
-                    ep['scenes_count'] = 0
-                    ep['status'] = 'missing'
-                    ep['duration_seconds'] = 0
+        for ep, stats in zip(episodes, episode_stats):
+            if stats:
+                ep['scenes_count'] = stats['scenes_count']
+                ep['status'] = stats['status']
+                ep['duration_seconds'] = stats['duration_seconds']
 
         return project
 
@@ -229,8 +283,8 @@ class StatusCalculator:
         clue_field = 'clues_in_segment' if content_mode == 'narration' else 'clues_in_scene'
 
         for item in items:
-            chars_set.update(item.get(char_field, []))
-            clues_set.update(item.get(clue_field, []))
+            chars_set.update(item.get(char_field, ()))
+            clues_set.update(item.get(clue_field, ()))
 
         script['characters_in_episode'] = sorted(chars_set)
         script['clues_in_episode'] = sorted(clues_set)
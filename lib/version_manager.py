@@ -10,12 +10,17 @@ import shutil
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
+
+from lib.project_manager import write_json_file
 
 
 _LOCKS_GUARD = threading.Lock()
 _LOCKS_BY_VERSIONS_FILE: Dict[str, threading.RLock] = {}
 
+# versions.json 只读解析缓存：key -> ((st_mtime_ns, st_size), data)，读写均在文件锁内
+_READONLY_CACHE: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
 
 def _get_versions_file_lock(versions_file: Path) -> threading.RLock:
     key = str(Path(versions_file).resolve())
@@ -52,6 +57,7 @@ class VersionManager:
         self.versions_dir = self.project_path / "versions"
         self.versions_file = self.versions_dir / "versions.json"
         self._lock = _get_versions_file_lock(self.versions_file)
+        self._cache_key = str(self.versions_file.resolve())
 
         # 确保版本目录存在
         self._ensure_dirs()
@@ -70,18 +76,43 @@ class VersionManager:
         with open(self.versions_file, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    def _load_versions_readonly(self) -> Dict:
+        """
+        加载版本元数据（只读）
+
+        文件未变化（mtime/size 相同）时直接复用上次解析结果，调用方不得修改返回值。
+        """
+        try:
+            st = self.versions_file.stat()
+        except FileNotFoundError:
+            return {rt: {} for rt in self.RESOURCE_TYPES}
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _READONLY_CACHE.get(self._cache_key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        data = self._load_versions()
+        _READONLY_CACHE[self._cache_key] = (stamp, data)
+        return data
+
     def _save_versions(self, data: Dict) -> None:
-        """保存版本元数据"""
-        with open(self.versions_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """
+        保存版本元数据（整体编码后原子替换，并发读取不会看到写了一半的文件）
+
+        versions.json 只由程序读写，且每次生成都会整体重写、随版本数持续增长，因此写紧凑格式。
+        """
+        _, stamp = write_json_file(self.versions_file, data, pretty=False)
+        _READONLY_CACHE[self._cache_key] = (stamp, data)
 
-    def _generate_timestamp(self) -> str:
-        """生成时间戳字符串（用于文件名）"""
-        return datetime.now().strftime('%Y%m%dT%H%M%S')
+    def _generate_timestamp(self, now: Optional[datetime] = None) -> str:
+        """生成本地时间的时间戳字符串（用于文件名）；now 为 UTC 时刻，默认当前时间"""
+        local = now.astimezone() if now is not None else datetime.now()
+        return local.strftime('%Y%m%dT%H%M%S')
 
-    def _generate_iso_timestamp(self) -> str:
-        """生成 ISO 格式时间戳（用于元数据）"""
-        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    def _generate_iso_timestamp(self, now: Optional[datetime] = None) -> str:
+        """生成 UTC ISO 格式时间戳（用于元数据）；now 为 UTC 时刻，默认当前时间"""
+        return (now or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
 
     def get_versions(self, resource_type: str, resource_id: str) -> Dict:
         """
@@ -98,7 +129,7 @@ class VersionManager:
             raise ValueError(f"不支持的资源类型: {resource_type}")
 
         with self._lock:
-            data = self._load_versions()
+            data = self._load_versions_readonly()
             resource_data = data.get(resource_type, {}).get(resource_id)
 
             if not resource_data:
@@ -160,44 +191,173 @@ class VersionManager:
 
         with self._lock:
             data = self._load_versions()
+            new_version = self._append_version(
+                data, resource_type, resource_id, prompt, source_file, **metadata
+            )
+            self._save_versions(data)
+            return new_version
 
-            # 确保资源类型存在
-            if resource_type not in data:
-                data[resource_type] = {}
+    def _get_resource_data(self, data: Dict, resource_type: str, resource_id: str) -> Dict:
+        """获取或创建资源记录（就地修改 data）"""
+        return data.setdefault(resource_type, {}).setdefault(
+            resource_id, {"current_version": 0, "versions": []}
+        )
 
-            # 获取或创建资源记录
-            if resource_id not in data[resource_type]:
-                data[resource_type][resource_id] = {
-                    "current_version": 0,
-                    "versions": []
-                }
+    def _append_version(
+        self,
+        data: Dict,
+        resource_type: str,
+        resource_id: str,
+        prompt: str,
+        source_file: Optional[Path] = None,
+        **metadata
+    ) -> int:
+        """在已加载的元数据上追加一个版本（复制源文件），调用方负责加锁与保存"""
+        resource_data = self._get_resource_data(data, resource_type, resource_id)
+        new_version = resource_data["current_version"] + 1
+
+        # 生成版本文件名和路径（文件名与 created_at 取同一时刻）
+        now = datetime.now(timezone.utc)
+        version_rel_path = self._version_rel_path(resource_type, resource_id, new_version, now)
+        version_abs_path = self.project_path / version_rel_path
+
+        # 如果有源文件，复制到版本目录
+        if source_file and Path(source_file).exists():
+            # 版本目录可能在实例创建后被删除（如项目删除后重建），复制前重新确保存在
+            version_abs_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source_file, version_abs_path)
+
+        # 创建版本记录
+        version_record = {
+            "version": new_version,
+            "file": version_rel_path,
+            "prompt": prompt,
+            "created_at": self._generate_iso_timestamp(now),
+            **metadata
+        }
 
-            resource_data = data[resource_type][resource_id]
-            new_version = resource_data["current_version"] + 1
+        resource_data["versions"].append(version_record)
+        resource_data["current_version"] = new_version
+        return new_version
 
-            # 生成版本文件名和路径
-            timestamp = self._generate_timestamp()
-            ext = self.EXTENSIONS.get(resource_type, '.png')
-            version_filename = f"{resource_id}_v{new_version}_{timestamp}{ext}"
-            version_rel_path = f"versions/{resource_type}/{version_filename}"
-            version_abs_path = self.project_path / version_rel_path
+    def _version_rel_path(
+        self, resource_type: str, resource_id: str, version: int, now: Optional[datetime] = None
+    ) -> str:
+        timestamp = self._generate_timestamp(now)
+        ext = self.EXTENSIONS.get(resource_type, '.png')
+        version_filename = f"{resource_id}_v{version}_{timestamp}{ext}"
+        return f"versions/{resource_type}/{version_filename}"
+
+    def is_current_tracked(self, resource_type: str, resource_id: str) -> bool:
+        """
+        资源是否已有版本记录（current_version > 0）
+
+        只读取缓存的元数据，不访问媒体文件；用于在生成前跳过暂存步骤。
+        """
+        if resource_type not in self.RESOURCE_TYPES:
+            raise ValueError(f"不支持的资源类型: {resource_type}")
+
+        with self._lock:
+            data = self._load_versions_readonly()
+            resource_data = data.get(resource_type, {}).get(resource_id)
+            return bool(resource_data) and resource_data.get("current_version", 0) > 0
+
+    def stage_current_for_tracking(
+        self,
+        resource_type: str,
+        resource_id: str,
+        current_file: Path,
+        prompt: str,
+        **metadata
+    ) -> Optional[Dict]:
+        """
+        生成前暂存“未被记录的当前文件”
 
-            # 如果有源文件，复制到版本目录
-            if source_file and Path(source_file).exists():
-                shutil.copy2(source_file, version_abs_path)
+        与 ensure_current_tracked 的判断一致，但只复制文件、不写 versions.json；
+        返回的暂存记录交给 record_generation，与新版本在同一次读写中落盘。
 
-            # 创建版本记录
-            version_record = {
-                "version": new_version,
+        Args:
+            resource_type: 资源类型
+            resource_id: 资源 ID
+            current_file: 当前文件路径（即将被生成结果覆盖）
+            prompt: 当前文件对应的 prompt（用于记录）
+            **metadata: 额外元数据
+
+        Returns:
+            暂存的版本记录；若无需记录或文件不存在则返回 None
+        """
+        current_file = Path(current_file)
+        if not current_file.exists():
+            return None
+
+        if resource_type not in self.RESOURCE_TYPES:
+            raise ValueError(f"不支持的资源类型: {resource_type}")
+
+        with self._lock:
+            if self.is_current_tracked(resource_type, resource_id):
+                return None
+
+            now = datetime.now(timezone.utc)
+            version_rel_path = self._version_rel_path(resource_type, resource_id, 1, now)
+            version_abs_path = self.project_path / version_rel_path
+            version_abs_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(current_file, version_abs_path)
+            return {
+                "version": 1,
                 "file": version_rel_path,
                 "prompt": prompt,
-                "created_at": self._generate_iso_timestamp(),
+                "created_at": self._generate_iso_timestamp(now),
                 **metadata
             }
 
-            resource_data["versions"].append(version_record)
-            resource_data["current_version"] = new_version
+    def discard_staged(self, staged_current: Optional[Dict]) -> None:
+        """生成失败时删除暂存的旧文件副本（原文件未被覆盖，无需记录）"""
+        if staged_current:
+            (self.project_path / staged_current["file"]).unlink(missing_ok=True)
 
+    def record_generation(
+        self,
+        resource_type: str,
+        resource_id: str,
+        prompt: str,
+        source_file: Optional[Path] = None,
+        staged_current: Optional[Dict] = None,
+        **metadata
+    ) -> int:
+        """
+        记录一次生成结果（可连同生成前暂存的旧文件一起记录）
+
+        只读写一次 versions.json。
+
+        Args:
+            resource_type: 资源类型
+            resource_id: 资源 ID
+            prompt: 生成该版本使用的 prompt
+            source_file: 新生成的文件路径
+            staged_current: stage_current_for_tracking 返回的暂存记录
+            **metadata: 额外的元数据
+
+        Returns:
+            新版本号
+        """
+        if resource_type not in self.RESOURCE_TYPES:
+            raise ValueError(f"不支持的资源类型: {resource_type}")
+
+        with self._lock:
+            data = self._load_versions()
+
+            if staged_current:
+                resource_data = self._get_resource_data(data, resource_type, resource_id)
+                if resource_data["current_version"] == 0:
+                    resource_data["versions"].append(staged_current)
+                    resource_data["current_version"] = staged_current["version"]
+                else:
+                    # 暂存后已有其他调用记录了该资源，丢弃暂存副本
+                    self.discard_staged(staged_current)
+
+            new_version = self._append_version(
+                data, resource_type, resource_id, prompt, source_file, **metadata
+            )
             self._save_versions(data)
             return new_version
 
@@ -268,7 +428,7 @@ class VersionManager:
             raise ValueError(f"不支持的资源类型: {resource_type}")
 
         with self._lock:
-            if self.get_current_version(resource_type, resource_id) > 0:
+            if self.is_current_tracked(resource_type, resource_id):
                 return None
             return self.add_version(
                 resource_type=resource_type,
@@ -305,7 +465,7 @@ class VersionManager:
         current_file = Path(current_file)
 
         with self._lock:
-            data = self._load_versions()
+            data = self._load_versions_readonly()
             resource_data = data.get(resource_type, {}).get(resource_id)
 
             if not resource_data:
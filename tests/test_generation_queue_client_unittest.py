@@ -8,6 +8,7 @@ from lib.generation_queue_client import (
     TaskWaitTimeoutError,
     WorkerOfflineError,
     wait_for_task,
+    wait_for_tasks,
 )
 
 
@@ -63,6 +64,65 @@ class TestGenerationQueueClient(unittest.TestCase):
                 worker_offline_grace_seconds=0.2,
             )
 
+    def test_wait_for_task_returns_full_task_when_terminal(self):
+        queue = generation_queue_module.get_generation_queue()
+        task = queue.enqueue_task(
+            project_name="demo",
+            task_type="storyboard",
+            media_type="image",
+            resource_id="S03",
+            payload={"prompt": "p"},
+            script_file="episode_01.json",
+            source="skill",
+        )
+        queue.claim_next_task(media_type="image")
+        queue.mark_task_succeeded(task["task_id"], {"file_path": "storyboards/scene_S03.png"})
+
+        done = wait_for_task(
+            task["task_id"],
+            poll_interval=0.05,
+            timeout_seconds=1.0,
+            worker_offline_grace_seconds=10.0,
+        )
+        self.assertEqual(done["status"], "succeeded")
+        self.assertEqual(done["payload"]["prompt"], "p")
+        self.assertEqual(done["result"]["file_path"], "storyboards/scene_S03.png")
+
+    def test_wait_for_tasks_returns_all_terminal_tasks(self):
+        queue = generation_queue_module.get_generation_queue()
+        task_ids = [
+            queue.enqueue_task(
+                project_name="demo",
+                task_type="clue",
+                media_type="image",
+                resource_id=name,
+                payload={"prompt": name},
+                source="skill",
+            )["task_id"]
+            for name in ("玉佩", "老槐树")
+        ]
+        queue.claim_next_tasks(media_type="image", limit=2)
+        queue.mark_task_succeeded(task_ids[0], {"file_path": "clues/玉佩.png"})
+
+        with self.assertRaises(TaskWaitTimeoutError):
+            wait_for_tasks(
+                task_ids,
+                poll_interval=0.05,
+                timeout_seconds=0.2,
+                worker_offline_grace_seconds=10.0,
+            )
+
+        queue.mark_task_failed(task_ids[1], "boom")
+        done = wait_for_tasks(
+            task_ids,
+            poll_interval=0.05,
+            timeout_seconds=1.0,
+            worker_offline_grace_seconds=10.0,
+        )
+        self.assertEqual(set(done), set(task_ids))
+        self.assertEqual(done[task_ids[0]]["result"]["file_path"], "clues/玉佩.png")
+        self.assertEqual(done[task_ids[1]]["status"], "failed")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -91,6 +91,17 @@ class TestGenerationQueue(unittest.TestCase):
         latest_id = queue.get_latest_event_id()
         self.assertEqual(latest_id, all_events[-1]["id"])
 
+        # 事件本身只保存状态变化，完整任务行需通过 include_task 关联读取
+        self.assertNotIn("payload", all_events[0]["data"])
+        self.assertEqual(all_events[2]["data"]["error_message"], "mock error")
+
+        joined = queue.get_events_since(last_event_id=0, include_task=True)
+        self.assertEqual(joined[0]["event_type"], "queued")
+        self.assertEqual(joined[0]["status"], "queued")
+        self.assertEqual(joined[0]["data"]["task_id"], task["task_id"])
+        self.assertEqual(joined[0]["data"]["payload"]["prompt"], "video")
+        self.assertEqual(joined[0]["data"]["status"], "failed")
+
     def test_worker_lease_takeover(self):
         queue = self._create_queue()
 
@@ -148,6 +159,126 @@ class TestGenerationQueue(unittest.TestCase):
         events = queue.get_events_since(last_event_id=0)
         self.assertTrue(any(event["event_type"] == "requeued" for event in events))
 
+    def test_list_tasks_light_skips_payload_and_result(self):
+        queue = self._create_queue()
+
+        task = queue.enqueue_task(
+            project_name="demo",
+            task_type="storyboard",
+            media_type="image",
+            resource_id="E1S01",
+            payload={"prompt": "p" * 4096},
+            script_file="episode_01.json",
+            source="webui",
+        )
+
+        full = queue.list_tasks(project_name="demo")
+        self.assertEqual(full["items"][0]["payload"]["prompt"], "p" * 4096)
+
+        light = queue.list_tasks(project_name="demo", light=True)
+        self.assertEqual(light["total"], 1)
+        item = light["items"][0]
+        self.assertEqual(item["task_id"], task["task_id"])
+        self.assertEqual(item["status"], "queued")
+        self.assertNotIn("payload", item)
+        self.assertNotIn("result", item)
+
+        self.assertEqual(queue.list_tasks(project_name="demo", status="running")["total"], 0)
+        filtered = queue.list_tasks(status="queued", task_type="storyboard", source="webui")
+        self.assertEqual(filtered["items"][0]["task_id"], task["task_id"])
+
+        snapshot = queue.get_recent_tasks_snapshot(project_name="demo", light=True)
+        self.assertNotIn("payload", snapshot[0])
+
+    def test_get_tasks_bulk(self):
+        queue = self._create_queue()
+
+        task_ids = []
+        for i in range(3):
+            task = queue.enqueue_task(
+                project_name="demo",
+                task_type="storyboard",
+                media_type="image",
+                resource_id=f"E1S0{i}",
+                payload={"prompt": f"p{i}"},
+                script_file="episode_01.json",
+                source="webui",
+            )
+            task_ids.append(task["task_id"])
+        queue.claim_next_task(media_type="image")
+        queue.mark_task_succeeded(task_ids[0], {"file_path": "storyboards/scene_E1S00.png"})
+
+        tasks = queue.get_tasks([*task_ids, "missing", task_ids[1]])
+        self.assertEqual(set(tasks), set(task_ids))
+        self.assertEqual(tasks[task_ids[0]]["status"], "succeeded")
+        self.assertEqual(tasks[task_ids[2]]["payload"]["prompt"], "p2")
+        self.assertEqual(queue.get_tasks([]), {})
+
+    def test_claim_next_tasks_batch(self):
+        queue = self._create_queue()
+
+        task_ids = []
+        for i in range(3):
+            task = queue.enqueue_task(
+                project_name="demo",
+                task_type="video",
+                media_type="video",
+                resource_id=f"E1S0{i}",
+                payload={"prompt": "video"},
+                script_file="episode_01.json",
+                source="webui",
+            )
+            task_ids.append(task["task_id"])
+
+        claimed = queue.claim_next_tasks(media_type="video", limit=2)
+        self.assertEqual([task["task_id"] for task in claimed], task_ids[:2])
+        for task in claimed:
+            self.assertEqual(task["status"], "running")
+            stored = queue.get_task(task["task_id"])
+            self.assertEqual(stored["status"], "running")
+            self.assertEqual(stored["started_at"], task["started_at"])
+
+        self.assertEqual(queue.claim_next_tasks(media_type="video", limit=0), [])
+        self.assertEqual(queue.claim_next_tasks(media_type="image", limit=2), [])
+        rest = queue.claim_next_tasks(media_type="video", limit=5)
+        self.assertEqual([task["task_id"] for task in rest], task_ids[2:])
+
+        events = queue.get_events_since(last_event_id=0)
+        self.assertEqual(sum(1 for event in events if event["event_type"] == "running"), 3)
+
+    def test_mark_task_results_bulk(self):
+        queue = self._create_queue()
+
+        task_ids = []
+        for i in range(2):
+            task = queue.enqueue_task(
+                project_name="demo",
+                task_type="storyboard",
+                media_type="image",
+                resource_id=f"E1S0{i}",
+                payload={"prompt": "img"},
+                script_file="episode_01.json",
+                source="webui",
+            )
+            task_ids.append(task["task_id"])
+        queue.claim_next_tasks(media_type="image", limit=2)
+
+        finished = queue.mark_task_results_bulk(
+            [
+                (task_ids[0], True, {"file_path": "a.png"}),
+                (task_ids[1], False, "boom"),
+                ("missing", True, {}),
+            ]
+        )
+        self.assertEqual([task["status"] for task in finished], ["succeeded", "failed"])
+        self.assertEqual(queue.get_task(task_ids[0])["result"], {"file_path": "a.png"})
+        self.assertEqual(queue.get_task(task_ids[1])["error_message"], "boom")
+
+        events = queue.get_events_since(last_event_id=0)
+        self.assertEqual(
+            [event["event_type"] for event in events][-2:], ["succeeded", "failed"]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
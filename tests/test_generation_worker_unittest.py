@@ -0,0 +1,134 @@
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from lib.generation_queue import GenerationQueue
+from lib.generation_worker import GenerationWorker
+
+
+class TestGenerationWorker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.queue = GenerationQueue(db_path=Path(tmp.name) / "queue.db")
+
+        patcher = mock.patch(
+            "webui.server.services.generation_tasks.execute_generation_task",
+            side_effect=lambda task: {"resource_id": task["resource_id"]},
+        )
+        self.execute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_worker(self) -> GenerationWorker:
+        worker = GenerationWorker(queue=self.queue)
+        worker.heartbeat_interval = 0.05
+        worker.poll_interval = 0.05
+        worker.FLUSH_RETRY_INITIAL_SEC = 0.01
+        return worker
+
+    def _enqueue(self, resource_id: str) -> str:
+        return self.queue.enqueue_task(
+            project_name="demo",
+            task_type="storyboard",
+            media_type="image",
+            resource_id=resource_id,
+            payload={"prompt": "p"},
+            script_file="episode_01.json",
+        )["task_id"]
+
+    async def _wait_for_status(self, task_id: str, status: str, timeout: float = 5.0) -> None:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.queue.get_task_status(task_id) != status:
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail(f"task {task_id} did not reach {status}")
+            await asyncio.sleep(0.02)
+
+    async def test_executes_task_and_persists_result(self):
+        worker = self._create_worker()
+        await worker.start()
+        try:
+            task_id = self._enqueue("E1S01")
+            await self._wait_for_status(task_id, "succeeded")
+        finally:
+            await worker.stop()
+
+        self.assertEqual(self.queue.get_task(task_id)["result"], {"resource_id": "E1S01"})
+        self.assertFalse(self.queue.is_worker_online())
+
+    async def test_failed_result_write_is_retried(self):
+        worker = self._create_worker()
+        original = self.queue.mark_task_results_bulk
+        calls = []
+
+        def flaky(results):
+            calls.append(list(results))
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return original(results)
+
+        with mock.patch.object(self.queue, "mark_task_results_bulk", side_effect=flaky):
+            await worker.start()
+            try:
+                task_id = self._enqueue("E1S01")
+                await self._wait_for_status(task_id, "succeeded")
+            finally:
+                await worker.stop()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0], calls[1])
+
+    def test_requeue_failure_drops_lease_and_retries_on_next_renew(self):
+        worker = self._create_worker()
+        with mock.patch.object(
+            self.queue, "requeue_running_tasks", side_effect=RuntimeError("boom")
+        ) as requeue:
+            worker._renew_lease()
+            self.assertFalse(worker._owns_lease)
+            worker._renew_lease()
+            self.assertFalse(worker._owns_lease)
+        self.assertEqual(requeue.call_count, 2)
+
+        worker._renew_lease()
+        self.assertTrue(worker._owns_lease)
+
+    async def test_reacquired_lease_keeps_running_tasks_while_results_are_retried(self):
+        worker = self._create_worker()
+        worker.FLUSH_RETRY_INITIAL_SEC = 10.0
+        with mock.patch.object(
+            self.queue, "mark_task_results_bulk", side_effect=RuntimeError("database is locked")
+        ):
+            retry = asyncio.create_task(
+                worker._write_results_with_retry([("t1", True, {})], stopping=False)
+            )
+            await asyncio.sleep(0)
+            self.assertTrue(worker._completion_queue.empty())
+
+            with mock.patch.object(self.queue, "requeue_running_tasks") as requeue:
+                worker._renew_lease()
+            self.assertTrue(worker._owns_lease)
+            requeue.assert_not_called()
+
+            retry.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await retry
+        self.assertEqual(worker._unwritten_results, 0)
+
+    async def test_run_loop_exits_and_releases_lease_when_heartbeat_dies(self):
+        worker = self._create_worker()
+
+        async def dead_heartbeat():
+            raise RuntimeError("heartbeat crashed")
+
+        with mock.patch.object(worker, "_lease_heartbeat", side_effect=dead_heartbeat):
+            await worker.start()
+            await asyncio.wait_for(worker._main_task, timeout=5.0)
+
+        self.assertFalse(worker._owns_lease)
+        self.assertFalse(self.queue.is_worker_online())
+        await worker.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
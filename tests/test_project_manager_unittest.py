@@ -0,0 +1,349 @@
+import json
+import shutil
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import lib.project_manager as project_manager_module
+from lib.project_manager import ProjectManager
+from lib.status_calculator import StatusCalculator
+
+
+class TestProjectManagerScripts(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        self.pm = ProjectManager(Path(self.tmpdir.name) / "projects")
+        self.project_name = "demo"
+        self.pm.create_project(self.project_name)
+
+    def _scene(self, scene_id: str) -> dict:
+        return self.pm.create_scene_template(scene_id)
+
+    def test_load_script_returns_independent_copies_and_sees_external_writes(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["scenes"] = [self._scene("E1S01")]
+        path = self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        loaded = self.pm.load_script(self.project_name, "episode_1.json")
+        loaded["scenes"].clear()
+        self.assertEqual(len(self.pm.load_script(self.project_name, "episode_1.json")["scenes"]), 1)
+
+        # 外部直接改写文件后缓存失效
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw["scenes"].append(self._scene("E1S02"))
+        path.write_text(json.dumps(raw, ensure_ascii=False, indent=4), encoding="utf-8")
+        reloaded = self.pm.load_script(self.project_name, "episode_1.json")
+        self.assertEqual([s["scene_id"] for s in reloaded["scenes"]], ["E1S01", "E1S02"])
+
+        with self.assertRaises(FileNotFoundError):
+            self.pm.load_script(self.project_name, "missing.json")
+
+    def test_save_script_caches_written_data_with_file_stamp(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        path = self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        st = path.stat()
+        stamp, cached, raw = self.pm._script_cache[str(path)]
+        self.assertEqual(stamp, (st.st_mtime_ns, st.st_size))
+        self.assertEqual(cached, script)
+        self.assertEqual(raw, path.read_bytes())
+
+        # 缓存不与调用方共享：保存后继续修改不影响只读读取
+        script["scenes"].append(self._scene("E1S99"))
+        self.assertEqual(self.pm._load_script_readonly(self.project_name, "episode_1.json")["scenes"], [])
+
+    def test_save_script_serializes_datetime_and_path_values(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["metadata"]["exported_at"] = datetime(2024, 1, 2, 3, 4, 5)
+        script["source_path"] = Path("source") / "s.txt"
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        loaded = self.pm.load_script(self.project_name, "episode_1.json")
+        self.assertEqual(loaded["metadata"]["exported_at"], "2024-01-02T03:04:05")
+        self.assertEqual(loaded["source_path"], str(Path("source") / "s.txt"))
+
+    def test_bulk_asset_update_and_get_scene(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["content_mode"] = "drama"
+        script["scenes"] = [self._scene("E1S01"), self._scene("E1S02")]
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        self.pm.update_scene_assets_bulk(
+            self.project_name,
+            "episode_1.json",
+            [
+                ("E1S01", "storyboard_grid", "storyboards/grid_001.png"),
+                ("E1S02", "storyboard_grid", "storyboards/grid_001.png"),
+            ],
+        )
+        scene = self.pm.get_scene(self.project_name, "episode_1.json", "E1S02")
+        self.assertEqual(scene["generated_assets"]["storyboard_grid"], "storyboards/grid_001.png")
+        self.assertEqual(
+            [s["scene_id"] for s in self.pm.get_scenes_needing_individual(self.project_name, "episode_1.json")],
+            ["E1S01", "E1S02"],
+        )
+        pending = next(self.pm.iter_pending_scenes(self.project_name, "episode_1.json", "video_clip"))
+        pending["generated_assets"]["video_clip"] = "x"
+        self.assertEqual(len(self.pm.get_pending_scenes(self.project_name, "episode_1.json", "video_clip")), 2)
+
+        # 重复写入相同路径时不再落盘
+        path = self.pm.get_project_path(self.project_name) / "scripts" / "episode_1.json"
+        before = path.stat().st_mtime_ns
+        self.pm.update_scene_asset(
+            self.project_name, "episode_1.json", "E1S01", "storyboard_grid", "storyboards/grid_001.png"
+        )
+        self.assertEqual(path.stat().st_mtime_ns, before)
+
+        # 任一场景不存在时整体不保存
+        with self.assertRaises(KeyError):
+            self.pm.update_scene_assets_bulk(
+                self.project_name,
+                "episode_1.json",
+                [("E1S01", "video_clip", "videos/a.mp4"), ("E9S99", "video_clip", "x")],
+            )
+        scene = self.pm.get_scene(self.project_name, "episode_1.json", "E1S01")
+        self.assertIsNone(scene["generated_assets"].get("video_clip"))
+
+        with self.assertRaises(KeyError):
+            self.pm.get_scene(self.project_name, "episode_1.json", "E9S99")
+
+    def test_add_scenes_bulk_numbers_scenes_in_one_write(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["scenes"] = [self._scene("001")]
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        updated = self.pm.add_scenes_bulk(
+            self.project_name, "episode_1.json", [{"visual": {}}, {"visual": {}}]
+        )
+        self.assertEqual([s["scene_id"] for s in updated["scenes"]], ["001", "002", "003"])
+        self.pm.add_scene(self.project_name, "episode_1.json", {})
+        loaded = self.pm.load_script(self.project_name, "episode_1.json")
+        self.assertEqual(loaded["scenes"][-1]["scene_id"], "004")
+        self.assertEqual(loaded["scenes"][-1]["generated_assets"]["status"], "pending")
+
+    def test_normalize_scene_fills_defaults_without_sharing_containers(self):
+        first = self.pm.normalize_scene({"scene_id": "E1S01", "visual": {"mood": "calm"}}, episode=2)
+        second = self.pm.normalize_scene({"scene_id": "E1S02"}, episode=2)
+
+        self.assertEqual(first["visual"]["mood"], "calm")
+        self.assertEqual(first["visual"]["shot_type"], "medium shot")
+        self.assertEqual(first["episode"], 2)
+        self.assertEqual(second["dialogue"]["emotion"], "neutral")
+
+        first["characters_in_scene"].append("A")
+        first["audio"]["sound_effects"].append("rain")
+        first["dialogue"]["speaker"] = "A"
+        self.assertEqual(second["characters_in_scene"], [])
+        self.assertEqual(second["audio"]["sound_effects"], [])
+        self.assertEqual(second["dialogue"]["speaker"], "")
+
+    def test_normalize_script_skips_unchanged_normalized_file(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["scenes"] = [{"scene_id": "E1S01"}]
+        path = self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        normalized = self.pm.normalize_script(self.project_name, "episode_1.json")
+        self.assertEqual(normalized["scenes"][0]["visual"]["shot_type"], "medium shot")
+        before = path.stat().st_mtime_ns
+        self.pm.normalize_script(self.project_name, "episode_1.json")
+        self.assertEqual(path.stat().st_mtime_ns, before)
+
+        # 外部追加未规范化的场景后重新补全
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw["scenes"].append({"scene_id": "E1S02"})
+        path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+        normalized = self.pm.normalize_script(self.project_name, "episode_1.json")
+        self.assertEqual(normalized["scenes"][1]["transition_to_next"], "cut")
+
+    def test_normalize_script_records_stamp_of_its_own_write(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["scenes"] = [{"scene_id": "E1S01"}]
+        path = self.pm.save_script(self.project_name, script, "episode_1.json")
+        external = json.dumps({**script, "scenes": [{"scene_id": "E1S01"}, {"scene_id": "E1S02"}]})
+
+        real_write = project_manager_module.write_json_file
+
+        def write_then_external_write(target, data, **kwargs):
+            result = real_write(target, data, **kwargs)
+            # 模拟其他进程在 os.replace 之后立即写入未规范化的剧本
+            if target == path:
+                target.write_text(external, encoding="utf-8")
+            return result
+
+        with mock.patch.object(project_manager_module, "write_json_file", write_then_external_write):
+            self.pm.normalize_script(self.project_name, "episode_1.json")
+
+        normalized = self.pm.normalize_script(self.project_name, "episode_1.json")
+        self.assertEqual(normalized["scenes"][1]["transition_to_next"], "cut")
+
+    def test_normalize_script_migrates_legacy_characters_and_clues(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["characters"] = {"A": {"description": "a", "voice_style": "", "character_sheet": ""}}
+        script["clues"] = {"玉佩": {"type": "prop", "description": "青色", "importance": "major"}}
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        normalized = self.pm.normalize_script(self.project_name, "episode_1.json")
+        self.assertNotIn("characters", normalized)
+        self.assertNotIn("clues", self.pm.load_script(self.project_name, "episode_1.json"))
+        project = self.pm.load_project(self.project_name)
+        self.assertEqual(project["characters"]["A"]["description"], "a")
+        self.assertEqual(project["clues"]["玉佩"]["importance"], "major")
+
+    def test_enrich_project_reads_each_episode_once(self):
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        scene = self._scene("E1S01")
+        scene["generated_assets"]["storyboard_image"] = "storyboards/scene_E1S01.png"
+        script["scenes"] = [scene, self._scene("E1S02")]
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+
+        project = self.pm.create_project_metadata(self.project_name, "Demo")
+        project_dir = self.pm.get_project_path(self.project_name)
+        (project_dir / "characters").mkdir(exist_ok=True)
+        (project_dir / "characters" / "A.png").write_bytes(b"png")
+        project["characters"] = {
+            "A": {"character_sheet": "characters/A.png"},
+            "B": {"character_sheet": "characters/B.png"},
+            "C": {"character_sheet": ""},
+        }
+        project["episodes"] = [
+            {"episode": 1, "script_file": "scripts/episode_1.json"},
+            {"episode": 2, "script_file": "scripts/episode_2.json"},
+            {"episode": 3},
+        ]
+        self.pm.save_project(self.project_name, project)
+
+        enriched = StatusCalculator(self.pm).enrich_project(self.project_name, project)
+        ep1, ep2, ep3 = enriched["episodes"]
+        self.assertEqual((ep1["scenes_count"], ep1["status"]), (2, "in_production"))
+        self.assertEqual((ep2["scenes_count"], ep2["status"]), (0, "missing"))
+        self.assertNotIn("status", ep3)
+        progress = enriched["status"]["progress"]
+        self.assertEqual(progress["storyboards"], {"total": 2, "completed": 1})
+        self.assertEqual(progress["characters"], {"total": 3, "completed": 1})
+
+    def test_project_status_filters_files_by_extension(self):
+        project_dir = self.pm.get_project_path(self.project_name)
+        for rel in ("characters/A.PNG", "characters/notes.txt", "videos/v.mp4", "source/novel.txt"):
+            (project_dir / rel).write_bytes(b"x")
+        (project_dir / "characters" / "nested.png").mkdir()
+
+        status = self.pm.get_project_status(self.project_name)
+        self.assertEqual(status["characters"], ["A.PNG"])
+        self.assertEqual(status["videos"], ["v.mp4"])
+        self.assertEqual(status["source_files"], ["novel.txt"])
+        self.assertEqual(status["current_stage"], "videos_generated")
+
+    def test_add_episode_keeps_order_and_skips_unchanged_writes(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        self.pm.add_episode(self.project_name, 2, "二", "scripts/episode_2.json")
+        self.pm.add_episode(self.project_name, 1, "一", "scripts/episode_1.json")
+        project = self.pm.add_episode(self.project_name, 3, "三", "scripts/episode_3.json")
+        self.assertEqual([ep["episode"] for ep in project["episodes"]], [1, 2, 3])
+
+        project_file = self.pm.get_project_path(self.project_name) / "project.json"
+        before = project_file.stat().st_mtime_ns
+        self.pm.add_episode(self.project_name, 2, "二", "scripts/episode_2.json")
+        self.assertEqual(project_file.stat().st_mtime_ns, before)
+
+        project = self.pm.add_episode(self.project_name, 2, "第二集", "scripts/episode_2.json")
+        self.assertEqual(project["episodes"][1]["title"], "第二集")
+
+    def test_save_script_syncs_episode_only_when_changed(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+        script["episode"] = 1
+        script["title"] = "第一集"
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+        project_file = self.pm.get_project_path(self.project_name) / "project.json"
+        self.assertEqual(
+            self.pm.load_project(self.project_name)["episodes"],
+            [{"episode": 1, "title": "第一集", "script_file": "scripts/episode_1.json"}],
+        )
+
+        before = project_file.stat().st_mtime_ns
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+        self.assertEqual(project_file.stat().st_mtime_ns, before)
+
+        script["title"] = "改名"
+        self.pm.save_script(self.project_name, script, "episode_1.json")
+        self.assertEqual(self.pm.load_project(self.project_name)["episodes"][0]["title"], "改名")
+
+    def test_project_path_cache_is_invalidated_on_forget(self):
+        project_dir = self.pm.get_project_path(self.project_name)
+        shutil.rmtree(project_dir)
+        self.assertEqual(self.pm.get_project_path(self.project_name), project_dir)
+
+        self.pm.forget_project_path(self.project_name)
+        with self.assertRaises(FileNotFoundError):
+            self.pm.get_project_path(self.project_name)
+
+    def test_parsed_cache_is_bounded_and_dropped_on_forget(self):
+        self.pm.PARSED_CACHE_MAX_ENTRIES = 2
+        for i in range(1, 4):
+            script = self.pm.create_script(self.project_name, "t", "c", "s.txt")
+            self.pm.save_script(self.project_name, script, f"episode_{i}.json")
+        self.assertEqual(len(self.pm._script_cache), 2)
+        self.assertEqual(self.pm.load_script(self.project_name, "episode_1.json")["novel"]["title"], "t")
+
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        self.pm.forget_project_path(self.project_name)
+        self.assertEqual(len(self.pm._script_cache), 0)
+        self.assertEqual(len(self.pm._project_cache), 0)
+
+    def test_project_getters_return_copies_of_cached_project(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        self.pm.add_clue(self.project_name, "玉佩", "prop", "青色玉佩")
+
+        clue = self.pm.get_clue(self.project_name, "玉佩")
+        clue["description"] = "changed"
+        self.assertEqual(self.pm.get_clue(self.project_name, "玉佩")["description"], "青色玉佩")
+
+        # 外部改写 project.json 后缓存失效
+        project_file = self.pm.get_project_path(self.project_name) / "project.json"
+        raw = json.loads(project_file.read_text(encoding="utf-8"))
+        raw["clues"]["玉佩"]["description"] = "白玉佩"
+        project_file.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+        self.assertEqual(self.pm.get_clue(self.project_name, "玉佩")["description"], "白玉佩")
+        self.assertEqual(self.pm.load_project(self.project_name)["clues"]["玉佩"]["description"], "白玉佩")
+
+    def test_get_pending_clues_checks_sheets_on_disk(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        for name in ("玉佩", "古剑", "破庙"):
+            self.pm.add_clue(self.project_name, name, "prop", name, importance="major")
+        self.pm.add_clue(self.project_name, "茶杯", "prop", "茶杯")
+        self.pm.update_clue_sheet(self.project_name, "玉佩", "clues/玉佩.png")
+        self.pm.update_clue_sheet(self.project_name, "古剑", "clues/古剑.png")
+        (self.pm.get_project_path(self.project_name) / "clues" / "玉佩.png").write_bytes(b"png")
+
+        pending = self.pm.get_pending_clues(self.project_name)
+        self.assertEqual(sorted(c.name for c in pending), ["古剑", "破庙"])
+        self.assertEqual({c.name: c.clue_sheet for c in pending}, {"古剑": "clues/古剑.png", "破庙": ""})
+        self.assertEqual(list(self.pm.iter_pending_clues(self.project_name)), pending)
+
+    def test_collect_reference_images_dedupes_shared_sheets(self):
+        self.pm.create_project_metadata(self.project_name, "Demo")
+        self.pm.add_project_character(self.project_name, "A", "a", character_sheet="characters/A.png")
+        self.pm.add_project_character(self.project_name, "A2", "a", character_sheet="characters/A.png")
+        self.pm.add_project_character(self.project_name, "B", "b", character_sheet="characters/B.png")
+        project_dir = self.pm.get_project_path(self.project_name)
+        (project_dir / "characters" / "A.png").write_bytes(b"png")
+
+        refs = self.pm.collect_reference_images(
+            self.project_name, {"characters_in_scene": ["A", "A2", "A", "B"], "clues_in_scene": []}
+        )
+        self.assertEqual(refs, [project_dir / "characters" / "A.png"])
+
+        batch = self.pm.collect_reference_images_for_scenes(
+            self.project_name,
+            [{"characters_in_scene": ["B", "A"]}, {"clues_in_scene": []}],
+        )
+        self.assertEqual(batch, [[project_dir / "characters" / "A.png"], []])
+
+
+if __name__ == "__main__":
+    unittest.main()
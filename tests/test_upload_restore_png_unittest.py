@@ -69,7 +69,62 @@ class TestUploadRestorePng(unittest.TestCase):
             self.assertEqual(info["current_version"], 2)
             self.assertEqual(len(info["versions"]), 2)
 
+    def test_convert_png_passthrough_and_mode_normalization(self):
+        buf = BytesIO()
+        Image.new("RGBA", (8, 8), (255, 0, 0, 255)).save(buf, format="PNG")
+        png_bytes = buf.getvalue()
+        # 已是 RGBA PNG：原样返回，不重新编码
+        self.assertIs(convert_image_bytes_to_png(png_bytes), png_bytes)
+
+        buf = BytesIO()
+        Image.new("P", (8, 8)).save(buf, format="PNG")
+        converted = convert_image_bytes_to_png(buf.getvalue())
+        with Image.open(BytesIO(converted)) as img:
+            self.assertEqual(img.format, "PNG")
+            self.assertEqual(img.mode, "RGB")
+
+        buf = BytesIO()
+        Image.new("L", (8, 8), 128).save(buf, format="JPEG")
+        converted = convert_image_bytes_to_png(buf.getvalue())
+        with Image.open(BytesIO(converted)) as img:
+            self.assertEqual(img.format, "PNG")
+            self.assertEqual(img.mode, "L")
+
+        with self.assertRaises(ValueError):
+            convert_image_bytes_to_png(b"not an image")
+
+        # 截断的 PNG 头部可解析，但直通前的完整解码应拒绝
+        buf = BytesIO()
+        Image.new("RGB", (64, 64), (0, 255, 0)).save(buf, format="PNG")
+        with self.assertRaises(ValueError):
+            convert_image_bytes_to_png(buf.getvalue()[:-40])
+
+    def test_record_generation_tracks_staged_prior_file(self):
+        with TemporaryDirectory() as tmpdir:
+            project_path = Path(tmpdir)
+            (project_path / "characters").mkdir()
+            current_file = project_path / "characters" / "Alice.png"
+            Image.new("RGB", (4, 4), (255, 0, 0)).save(current_file, format="PNG")
+
+            vm = VersionManager(project_path)
+            staged = vm.stage_current_for_tracking("characters", "Alice", current_file, "old")
+            self.assertIsNotNone(staged)
+            self.assertEqual(vm.get_versions("characters", "Alice")["current_version"], 0)
+
+            Image.new("RGB", (4, 4), (0, 0, 255)).save(current_file, format="PNG")
+            new_version = vm.record_generation(
+                "characters", "Alice", "new", source_file=current_file, staged_current=staged
+            )
+
+            self.assertEqual(new_version, 2)
+            info = vm.get_versions("characters", "Alice")
+            self.assertEqual([v["prompt"] for v in info["versions"]], ["old", "new"])
+            with Image.open(project_path / staged["file"]) as prior:
+                self.assertEqual(prior.convert("RGB").getpixel((0, 0)), (255, 0, 0))
+
+            # 已有版本后不再暂存
+            self.assertIsNone(vm.stage_current_for_tracking("characters", "Alice", current_file, "x"))
+
 
 if __name__ == "__main__":
     unittest.main()
-
@@ -3,18 +3,13 @@
 """
 
 from typing import Optional
-from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from lib.project_manager import ProjectManager
+from webui.server.services.projects import pm
 
 router = APIRouter()
 
-# 初始化项目管理器
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
-
 
 class CreateClueRequest(BaseModel):
     name: str
@@ -4,8 +4,8 @@
 处理文件上传和静态资源服务
 """
 
-import json
 import os
+import re
 import urllib.parse
 from pathlib import Path
 
@@ -13,22 +13,23 @@ from fastapi import APIRouter, Body, File, HTTPException, UploadFile
 from fastapi.responses import FileResponse, PlainTextResponse
 
 from lib.gemini_client import GeminiClient
-from lib.image_utils import convert_image_bytes_to_png
-from lib.project_manager import ProjectManager
+from lib.image_utils import convert_image_bytes_to_png_async
+from webui.server.services.projects import pm
 
 router = APIRouter()
 
-# 初始化项目管理器
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
 
-# 允许的文件类型
+# 草稿文件名中的步骤编号（如 step1_segments.md）
+_STEP_NUMBER_RE = re.compile(r"step(\d+)")
+
+# 允许的文件类型（模块加载时构建一次的元组，保留顺序用于错误提示）
+IMAGE_UPLOAD_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
 ALLOWED_EXTENSIONS = {
-    "source": [".txt", ".md", ".doc", ".docx"],
-    "character": [".png", ".jpg", ".jpeg", ".webp"],
-    "character_ref": [".png", ".jpg", ".jpeg", ".webp"],
-    "clue": [".png", ".jpg", ".jpeg", ".webp"],
-    "storyboard": [".png", ".jpg", ".jpeg", ".webp"],
+    "source": (".txt", ".md", ".doc", ".docx"),
+    "character": IMAGE_UPLOAD_EXTENSIONS,
+    "character_ref": IMAGE_UPLOAD_EXTENSIONS,
+    "clue": IMAGE_UPLOAD_EXTENSIONS,
+    "storyboard": IMAGE_UPLOAD_EXTENSIONS,
 }
 
 
@@ -74,7 +75,7 @@ async def upload_file(
     if ext not in ALLOWED_EXTENSIONS[upload_type]:
         raise HTTPException(
             status_code=400,
-            detail=f"不支持的文件类型 {ext}，允许的类型: {ALLOWED_EXTENSIONS[upload_type]}",
+            detail=f"不支持的文件类型 {ext}，允许的类型: {', '.join(ALLOWED_EXTENSIONS[upload_type])}",
         )
 
     try:
@@ -121,7 +122,7 @@ async def upload_file(
         content = await file.read()
         if upload_type in ("character", "character_ref", "clue", "storyboard"):
             try:
-                content = convert_image_bytes_to_png(content)
+                content = await convert_image_bytes_to_png_async(content)
             except ValueError:
                 raise HTTPException(status_code=400, detail="无效的图片文件，无法解析")
 
@@ -193,17 +194,20 @@ async def list_project_files(project_name: str):
         }
 
         for subdir, file_list in files.items():
-            subdir_path = project_dir / subdir
-            if subdir_path.exists():
-                for f in subdir_path.iterdir():
-                    if f.is_file() and not f.name.startswith("."):
-                        file_list.append(
-                            {
-                                "name": f.name,
-                                "size": f.stat().st_size,
-                                "url": f"/api/v1/files/{project_name}/{subdir}/{f.name}",
-                            }
-                        )
+            # scandir 的 DirEntry 自带文件类型，省去 exists()/is_file() 的额外 stat
+            try:
+                with os.scandir(project_dir / subdir) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.startswith("."):
+                            file_list.append(
+                                {
+                                    "name": entry.name,
+                                    "size": entry.stat().st_size,
+                                    "url": f"/api/v1/files/{project_name}/{subdir}/{entry.name}",
+                                }
+                            )
+            except FileNotFoundError:
+                continue
 
         return {"files": files}
 
@@ -326,9 +330,7 @@ async def list_drafts(project_name: str):
 
 def _extract_step_number(filename: str) -> int:
     """从文件名提取步骤编号"""
-    import re
-
-    match = re.search(r"step(\d+)", filename)
+    match = _STEP_NUMBER_RE.search(filename)
     return int(match.group(1)) if match else 0
 
 
@@ -363,14 +365,11 @@ def _get_step_title(filename: str) -> str:
     return titles.get(filename, filename)
 
 
-def _get_content_mode(project_dir: Path) -> str:
-    """从 project.json 读取 content_mode"""
-    project_json_path = project_dir / "project.json"
-    if project_json_path.exists():
-        with open(project_json_path, "r", encoding="utf-8") as f:
-            project_data = json.load(f)
-            return project_data.get("content_mode", "drama")
-    return "drama"
+def _get_content_mode(project_name: str) -> str:
+    """从 project.json 读取 content_mode（经 ProjectManager 缓存解析）"""
+    if not pm.project_exists(project_name):
+        return "drama"
+    return pm.load_project(project_name).get("content_mode", "drama")
 
 
 @router.get("/projects/{project_name}/drafts/{episode}/step{step_num}")
@@ -378,7 +377,7 @@ async def get_draft_content(project_name: str, episode: int, step_num: int):
     """获取特定步骤的草稿内容"""
     try:
         project_dir = pm.get_project_path(project_name)
-        content_mode = _get_content_mode(project_dir)
+        content_mode = _get_content_mode(project_name)
         step_files = _get_step_files(content_mode)
 
         if step_num not in step_files:
@@ -408,7 +407,7 @@ async def update_draft_content(
     """更新草稿内容"""
     try:
         project_dir = pm.get_project_path(project_name)
-        content_mode = _get_content_mode(project_dir)
+        content_mode = _get_content_mode(project_name)
         step_files = _get_step_files(content_mode)
 
         if step_num not in step_files:
@@ -431,7 +430,7 @@ async def delete_draft(project_name: str, episode: int, step_num: int):
     """删除草稿文件"""
     try:
         project_dir = pm.get_project_path(project_name)
-        content_mode = _get_content_mode(project_dir)
+        content_mode = _get_content_mode(project_name)
         step_files = _get_step_files(content_mode)
 
         if step_num not in step_files:
@@ -465,10 +464,10 @@ async def upload_style_image(project_name: str, file: UploadFile = File(...)):
     """
     # 检查文件类型
     ext = Path(file.filename).suffix.lower()
-    if ext not in [".png", ".jpg", ".jpeg", ".webp"]:
+    if ext not in IMAGE_UPLOAD_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"不支持的文件类型 {ext}，允许的类型: .png, .jpg, .jpeg, .webp",
+            detail=f"不支持的文件类型 {ext}，允许的类型: {', '.join(IMAGE_UPLOAD_EXTENSIONS)}",
         )
 
     try:
@@ -477,7 +476,7 @@ async def upload_style_image(project_name: str, file: UploadFile = File(...)):
         # 保存图片（统一转换为 PNG）
         content = await file.read()
         try:
-            png_content = convert_image_bytes_to_png(content)
+            png_content = await convert_image_bytes_to_png_async(content)
         except ValueError:
             raise HTTPException(status_code=400, detail="无效的图片文件，无法解析")
 
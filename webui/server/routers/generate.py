@@ -4,21 +4,17 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Optional, Union
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from lib.generation_queue import get_generation_queue
-from lib.project_manager import ProjectManager
+from webui.server.services.projects import pm
 
 
 router = APIRouter()
 
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
-
 
 class GenerateStoryboardRequest(BaseModel):
     prompt: Union[str, dict]
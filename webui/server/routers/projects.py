@@ -4,20 +4,21 @@
 处理项目的 CRUD 操作，复用 lib/project_manager.py
 """
 
+import asyncio
+import os
 import shutil
 from typing import Optional, List
 from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from lib.project_manager import ProjectManager
 from lib.status_calculator import StatusCalculator
+from webui.server.services.projects import pm
+from webui.server.services.generation_tasks import forget_media_generators
 
 router = APIRouter()
 
-# 初始化项目管理器和状态计算器
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
+# 初始化状态计算器
 calc = StatusCalculator(pm)
 
 
@@ -35,60 +36,75 @@ class UpdateProjectRequest(BaseModel):
     aspect_ratio: Optional[dict] = None
 
 
-@router.get("/projects")
-async def list_projects():
-    """列出所有项目"""
-    projects = []
-    for name in pm.list_projects():
-        try:
-            # 尝试加载项目元数据
-            if pm.project_exists(name):
-                project = pm.load_project(name)
-                # 获取缩略图（第一个分镜图）
-                project_dir = pm.get_project_path(name)
-                storyboards_dir = project_dir / "storyboards"
-                thumbnail = None
-                if storyboards_dir.exists():
-                    scene_images = sorted(storyboards_dir.glob("scene_*.png"))
-                    if scene_images:
-                        thumbnail = f"/api/v1/files/{name}/storyboards/{scene_images[0].name}"
-
-                # 使用 StatusCalculator 计算进度（读时计算）
-                progress = calc.calculate_project_progress(name)
-                current_phase = calc.calculate_current_phase(progress)
-
-                projects.append({
-                    "name": name,
-                    "title": project.get("title", name),
-                    "style": project.get("style", ""),
-                    "thumbnail": thumbnail,
-                    "progress": progress,
-                    "current_phase": current_phase
-                })
-            else:
-                # 没有 project.json 的项目
-                status = pm.get_project_status(name)
-                projects.append({
-                    "name": name,
-                    "title": name,
-                    "style": "",
-                    "thumbnail": None,
-                    "progress": {},
-                    "current_phase": status.get("current_stage", "empty")
-                })
-        except Exception as e:
-            # 出错时返回基本信息
-            projects.append({
+def _summarize_project(name: str) -> dict:
+    """汇总单个项目的列表信息（同步文件 I/O，由 list_projects 放入线程池并发执行）"""
+    try:
+        # 尝试加载项目元数据
+        if pm.project_exists(name):
+            project = pm.load_project(name)
+            # 获取缩略图（第一个分镜图）
+            project_dir = pm.get_project_path(name)
+            thumbnail = None
+            try:
+                # 只需按文件名排序的第一张，取 min 即可，无需构造 Path 列表再排序
+                with os.scandir(project_dir / "storyboards") as entries:
+                    first_image = min(
+                        (
+                            entry.name
+                            for entry in entries
+                            if entry.name.startswith("scene_") and entry.name.endswith(".png")
+                        ),
+                        default=None,
+                    )
+            except FileNotFoundError:
+                first_image = None
+            if first_image:
+                thumbnail = f"/api/v1/files/{name}/storyboards/{first_image}"
+
+            # 使用 StatusCalculator 计算进度（读时计算）
+            progress = calc.calculate_project_progress(name)
+            current_phase = calc.calculate_current_phase(progress)
+
+            return {
+                "name": name,
+                "title": project.get("title", name),
+                "style": project.get("style", ""),
+                "thumbnail": thumbnail,
+                "progress": progress,
+                "current_phase": current_phase
+            }
+        else:
+            # 没有 project.json 的项目
+            status = pm.get_project_status(name)
+            return {
                 "name": name,
                 "title": name,
                 "style": "",
                 "thumbnail": None,
                 "progress": {},
-                "current_phase": "error",
-                "error": str(e)
-            })
+                "current_phase": status.get("current_stage", "empty")
+            }
+    except Exception as e:
+        # 出错时返回基本信息
+        return {
+            "name": name,
+            "title": name,
+            "style": "",
+            "thumbnail": None,
+            "progress": {},
+            "current_phase": "error",
+            "error": str(e)
+        }
+
 
-    return {"projects": projects}
+@router.get("/projects")
+async def list_projects():
+    """列出所有项目"""
+    # 各项目的读取互不依赖，放到线程中并发执行，避免逐个串行等待文件 I/O 并阻塞事件循环
+    projects = await asyncio.gather(
+        *(asyncio.to_thread(_summarize_project, name) for name in pm.list_projects())
+    )
+    return {"projects": list(projects)}
 
 
 @router.post("/projects")
@@ -169,6 +185,8 @@ async def delete_project(name: str):
     try:
         project_dir = pm.get_project_path(name)
         shutil.rmtree(project_dir)
+        pm.forget_project_path(name)
+        forget_media_generators()
         return {"success": True, "message": f"项目 '{name}' 已删除"}
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"项目 '{name}' 不存在")
@@ -68,6 +68,7 @@ async def list_tasks(
     source: Optional[str] = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=500),
+    light: bool = False,
 ):
     queue = get_generation_queue()
     return queue.list_tasks(
@@ -77,6 +78,7 @@ async def list_tasks(
         source=source,
         page=page,
         page_size=page_size,
+        light=light,
     )
 
 
@@ -88,6 +90,7 @@ async def list_project_tasks(
     source: Optional[str] = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=500),
+    light: bool = False,
 ):
     queue = get_generation_queue()
     return queue.list_tasks(
@@ -97,6 +100,7 @@ async def list_project_tasks(
         source=source,
         page=page,
         page_size=page_size,
+        light=light,
     )
 
 
@@ -143,6 +147,7 @@ async def stream_tasks(
                 last_event_id=cursor,
                 project_name=project_name,
                 limit=200,
+                include_task=True,
             )
             if events:
                 for event in events:
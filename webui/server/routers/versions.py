@@ -4,18 +4,13 @@
 处理版本查询和还原请求。
 """
 
-from pathlib import Path
 from fastapi import APIRouter, HTTPException
 
-from lib.project_manager import ProjectManager
 from lib.version_manager import VersionManager
+from webui.server.services.projects import pm
 
 router = APIRouter()
 
-# 初始化项目管理器
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
-
 
 def get_version_manager(project_name: str) -> VersionManager:
     """获取项目的版本管理器"""
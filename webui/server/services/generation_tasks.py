@@ -4,12 +4,13 @@ Task execution service for queued generation jobs.
 
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from lib.gemini_client import GeminiClient, get_shared_rate_limiter
 from lib.media_generator import MediaGenerator
-from lib.project_manager import ProjectManager
+from lib.project_manager import make_exists_checker
 from lib.prompt_builders import build_character_prompt, build_clue_prompt
 from lib.prompt_utils import (
     image_prompt_to_yaml,
@@ -17,16 +18,26 @@ from lib.prompt_utils import (
     is_structured_video_prompt,
     video_prompt_to_yaml,
 )
+from webui.server.services.projects import pm
 
 
-project_root = Path(__file__).parent.parent.parent.parent
-pm = ProjectManager(project_root / "projects")
 rate_limiter = get_shared_rate_limiter()
 
 
+@functools.lru_cache(maxsize=32)
+def _get_cached_media_generator(project_path: str) -> MediaGenerator:
+    # 按项目复用 MediaGenerator，避免每个任务重建 GeminiClient / VersionManager / UsageTracker
+    return MediaGenerator(Path(project_path), rate_limiter=rate_limiter)
+
+
 def get_media_generator(project_name: str) -> MediaGenerator:
     project_path = pm.get_project_path(project_name)
-    return MediaGenerator(project_path, rate_limiter=rate_limiter)
+    return _get_cached_media_generator(str(project_path))
+
+
+def forget_media_generators() -> None:
+    """删除项目后清空 MediaGenerator 缓存，避免同名项目重建后复用指向旧目录状态的实例"""
+    _get_cached_media_generator.cache_clear()
 
 
 def get_aspect_ratio(project: dict, resource_type: str) -> str:
@@ -44,17 +55,17 @@ def get_aspect_ratio(project: dict, resource_type: str) -> str:
     return "16:9"
 
 
-def normalize_veo_duration_seconds(duration_seconds: Optional[int]) -> str:
+def normalize_veo_duration_seconds(duration_seconds: Optional[int]) -> int:
     try:
         value = int(duration_seconds) if duration_seconds is not None else 4
     except (TypeError, ValueError):
         value = 4
 
     if value <= 4:
-        return "4"
+        return 4
     if value <= 6:
-        return "6"
-    return "8"
+        return 6
+    return 8
 
 
 def _get_items_from_script(script: dict) -> Tuple[List[dict], str, str, str]:
@@ -148,31 +159,28 @@ def _collect_reference_images(
     extra_reference_images: Optional[List[str]] = None,
 ) -> Optional[List[Path]]:
     reference_images: List[Path] = []
+    # 同目录的设计图只列一次目录，取代逐个 stat
+    ref_exists = make_exists_checker(project_path)
+    characters = project.get("characters", {})
+    clues = project.get("clues", {})
+
+    for char_name in target_item.get(char_field, ()):
+        sheet = (characters.get(char_name) or {}).get("character_sheet")
+        if sheet and ref_exists(sheet):
+            reference_images.append(project_path / sheet)
 
-    for char_name in target_item.get(char_field, []):
-        char_data = project.get("characters", {}).get(char_name, {})
-        sheet = char_data.get("character_sheet")
-        if sheet:
-            path = project_path / sheet
-            if path.exists():
-                reference_images.append(path)
-
-    for clue_name in target_item.get(clue_field, []):
-        clue_data = project.get("clues", {}).get(clue_name, {})
-        sheet = clue_data.get("clue_sheet")
-        if sheet:
-            path = project_path / sheet
-            if path.exists():
-                reference_images.append(path)
+    for clue_name in target_item.get(clue_field, ()):
+        sheet = (clues.get(clue_name) or {}).get("clue_sheet")
+        if sheet and ref_exists(sheet):
+            reference_images.append(project_path / sheet)
 
     for extra in extra_reference_images or []:
-        extra_path = Path(extra)
-        if not extra_path.is_absolute():
-            extra_path = project_path / extra_path
-        if extra_path.exists():
+        extra_path = project_path / extra
+        if ref_exists(extra_path):
             reference_images.append(extra_path)
 
-    return reference_images or None
+    # 同一设计图被多个名称引用时只上传一次（保持原有顺序）
+    return list(dict.fromkeys(reference_images)) or None
 
 
 def _get_grid_layout(scene_count: int) -> Tuple[int, int, str]:
@@ -302,22 +310,10 @@ def execute_video_task(project_name: str, resource_id: str, payload: Dict[str, A
         duration_seconds=duration_seconds,
     )
 
-    pm.update_scene_asset(
-        project_name=project_name,
-        script_filename=script_file,
-        scene_id=resource_id,
-        asset_type="video_clip",
-        asset_path=f"videos/scene_{resource_id}.mp4",
-    )
-
+    asset_updates = [(resource_id, "video_clip", f"videos/scene_{resource_id}.mp4")]
     if video_uri:
-        pm.update_scene_asset(
-            project_name=project_name,
-            script_filename=script_file,
-            scene_id=resource_id,
-            asset_type="video_uri",
-            asset_path=video_uri,
-        )
+        asset_updates.append((resource_id, "video_uri", video_uri))
+    pm.update_scene_assets_bulk(project_name, script_file, asset_updates)
 
     created_at = generator.versions.get_versions("videos", resource_id)["versions"][-1][
         "created_at"
@@ -456,8 +452,8 @@ def execute_storyboard_grid_task(project_name: str, payload: Dict[str, Any]) ->
     all_characters = set()
     all_clues = set()
     for scene in selected_scenes:
-        all_characters.update(scene.get(char_field, []))
-        all_clues.update(scene.get(clue_field, []))
+        all_characters.update(scene.get(char_field, ()))
+        all_clues.update(scene.get(clue_field, ()))
 
     reference_images: List[Path] = []
     characters = project.get("characters", {})
@@ -494,14 +490,14 @@ def execute_storyboard_grid_task(project_name: str, payload: Dict[str, Any]) ->
     )
 
     relative_path = f"storyboards/grid_{batch_id:03d}.png"
-    for scene in selected_scenes:
-        pm.update_scene_asset(
-            project_name=project_name,
-            script_filename=script_file,
-            scene_id=str(scene.get(id_field)),
-            asset_type="storyboard_grid",
-            asset_path=relative_path,
-        )
+    pm.update_scene_assets_bulk(
+        project_name,
+        script_file,
+        [
+            (str(scene.get(id_field)), "storyboard_grid", relative_path)
+            for scene in selected_scenes
+        ],
+    )
 
     return {
         "file_path": relative_path,
@@ -0,0 +1,14 @@
+"""
+Shared ProjectManager for the WebUI server.
+"""
+
+from pathlib import Path
+
+from lib.project_manager import ProjectManager
+
+
+project_root = Path(__file__).parent.parent.parent.parent
+
+# 所有路由与任务执行共用同一实例：项目路径与解析缓存只有一份，
+# 删除项目时的 forget_project_path 对所有调用方同时生效
+pm = ProjectManager(project_root / "projects")